@@ -1,7 +1,6 @@
 import typer
 import json
 from typing import Dict, Any, List, Optional, Tuple
-from InquirerPy import inquirer
 from scrapewizard.core.config import ConfigManager
 from scrapewizard.core.logging import log
 
@@ -14,6 +13,7 @@ def setup(
     """
     Configure ScrapeWizard global settings.
     """
+    from InquirerPy import inquirer
     log("Running setup...")
     
     current_config = ConfigManager.load_config()
@@ -8,7 +8,7 @@ from keyring.errors import KeyringError
 from urllib.parse import urlparse
 
 from scrapewizard.core.logging import log
-from scrapewizard.utils.file_io import safe_read_json, safe_write_json
+from scrapewizard.utils.file_io import atomic_write_json, safe_read_json, safe_write_json
 
 class ConfigManager:
     """Manages global configuration for ScrapeWizard with secure key storage."""
@@ -17,6 +17,7 @@ class ConfigManager:
     CONFIG_DIR = Path.home() / f".{APP_NAME}"
     CONFIG_FILE = CONFIG_DIR / "config.json"
     PROXY_FILE = CONFIG_DIR / "proxy.json"
+    PREFS_FILE = CONFIG_DIR / "prefs.json"
     SERVICE_NAME = "scrapewizard"
 
     DEFAULT_CONFIG = {
@@ -24,6 +25,9 @@ class ConfigManager:
         "model": "gpt-4-turbo"
     }
 
+    # (config path, mtime_ns, config) from the last load_config()
+    _config_cache: Optional[tuple] = None
+
     @classmethod
     def _key_name(cls, provider: str) -> str:
         return f"{provider}_api_key"
@@ -65,7 +69,15 @@ class ConfigManager:
 
     @classmethod
     def load_config(cls) -> Dict[str, Any]:
-        """Load global configuration, fetching API key from keyring."""
+        """Load global configuration, fetching API key from keyring.
+
+        The result is cached per process and reused until the config file
+        changes on disk or is rewritten through this class.
+        """
+        cached = cls._config_cache
+        if cached and cached[0] == cls.CONFIG_FILE and cached[1] == cls._config_mtime():
+            return cached[2].copy()
+
         # Always attempt migration first
         cls.migrate_from_plaintext()
         
@@ -77,12 +89,21 @@ class ConfigManager:
         provider = config.get("provider", "openai")
         config["api_key"] = cls.get_api_key(provider) or ""
         
-        return config
+        cls._config_cache = (cls.CONFIG_FILE, cls._config_mtime(), config)
+        return config.copy()
+
+    @classmethod
+    def _config_mtime(cls) -> Optional[int]:
+        try:
+            return cls.CONFIG_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
 
     @classmethod
     def save_config(cls, config: Dict[str, Any]):
         """Save global configuration, storing API key securely in keyring."""
         cls.ensure_config_dir()
+        cls._config_cache = None
         
         # Extract and save API key to keyring
         if "api_key" in config:
@@ -96,6 +117,7 @@ class ConfigManager:
     @classmethod
     def save_api_key(cls, provider: str, api_key: str):
         """Store an API key securely."""
+        cls._config_cache = None
         try:
             keyring.set_password(cls.SERVICE_NAME, cls._key_name(provider), api_key)
         except KeyringError as e:
@@ -134,6 +156,21 @@ class ConfigManager:
         cls.ensure_config_dir()
         safe_write_json(cls.PROXY_FILE, proxy_config)
 
+    @classmethod
+    def load_prefs(cls) -> Dict[str, Any]:
+        """Load remembered interactive choices (used as prompt defaults)."""
+        return safe_read_json(cls.PREFS_FILE)
+
+    @classmethod
+    def save_pref(cls, key: str, value: Any):
+        """Remember an interactive choice for the next session."""
+        prefs = cls.load_prefs()
+        if prefs.get(key) == value:
+            return
+        prefs[key] = value
+        cls.ensure_config_dir()
+        atomic_write_json(cls.PREFS_FILE, prefs)
+
     @classmethod
     def check_setup(cls) -> bool:
         """Check if essential configuration (API key) is set."""
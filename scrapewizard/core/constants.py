@@ -9,14 +9,27 @@ SCAN_NAVIGATION_TIMEOUT = 45
 # LLM Thresholds
 LLM_CONFIDENCE_THRESHOLD = 0.5
 SCRAPING_POSSIBLE_MIN_CONFIDENCE = 0.4
+LLM_SNAPSHOT_MAX_SECTIONS = 5  # Top-scored sections sent to codegen/repair
+LLM_SNAPSHOT_MAX_FIELDS = 20  # Candidate fields kept per section
+CODEGEN_MAX_TOKENS = 3072  # Response cap for generated scrapers
+REPAIR_MAX_TOKENS = 3072  # Response cap for repaired scrapers
 
 # Browser Settings
 DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
 HOSTILE_SITE_HOSTILITY_THRESHOLD = 40
+# Chromium subsystems headless recon never uses; skipping them speeds up launch
+HEADLESS_BROWSER_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-extensions",
+    "--no-first-run",
+]
 
 # Resource Limits
 MAX_INFINITE_SCROLL_INTERACTIONS = 50
 MAX_LOG_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
+NULL_SCAN_SAMPLE_ROWS = 500  # Rows sampled when estimating empty-column ratios
 
 # State Mapping
 STATE_EMOJIS = {
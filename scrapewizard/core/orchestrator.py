@@ -67,6 +67,11 @@ class Orchestrator:
             raise ValueError(f"Invalid project directory: {project_dir}")
         self.start_time = time.time()
         
+        # Paths joined on every state step, resolved once
+        self._scraper_path = self.project_dir / "generated_scraper.py"
+        self._output_dir = self.project_dir / "output"
+        self._data_json = self._output_dir / "data.json"
+        
         # Initialize session-persistent LLMClient with ad-hoc overrides
         self.llm_client = LLMClient(provider=ai_provider, api_key=ai_key, model=ai_model)
         
@@ -385,7 +390,7 @@ class Orchestrator:
                 
                 html = await browser.get_content()
                 
-                await browser.take_screenshot(self.project_dir / "debug_recon.png")
+                await browser.take_screenshot(self.project_dir / "debug_recon.jpg")
                 
                 # Analyze
                 analyzer = DOMAnalyzer(html)
@@ -640,7 +645,7 @@ class Orchestrator:
             log("Running auto-test on generated scraper...")
         
         success, output = ScriptTester.run_test(
-            self.project_dir / "generated_scraper.py",
+            self._scraper_path,
             self.project_dir,
             timeout=DEFAULT_SCRIPT_TIMEOUT,
             wizard_mode=self.wizard_mode
@@ -729,7 +734,7 @@ class Orchestrator:
                 self._transition_to(State.USER_CONFIG)
             elif action == "edit":
                 # Manual Edit - future feature, for now just log
-                log(f"Manual edit requested. Script is at: {self.project_dir}/generated_scraper.py")
+                log(f"Manual edit requested. Script is at: {self._scraper_path}")
                 input("Press ENTER when you have finished editing the script...")
                 self._transition_to(State.TEST)
             else:
@@ -737,7 +742,7 @@ class Orchestrator:
 
     def _load_output_data(self):
         """Load output/data.json if exists."""
-        return safe_read_json(self.project_dir / "output" / "data.json", default=None)
+        return safe_read_json(self._data_json, default=None)
 
     def _handle_repair(self) -> None:
         """Self-healing repair loop with optional column-specific hints."""
@@ -755,7 +760,7 @@ class Orchestrator:
         
         def runner():
             return ScriptTester.run_test(
-                self.project_dir / "generated_scraper.py",
+                self._scraper_path,
                 self.project_dir,
                 timeout=DEFAULT_SCRIPT_TIMEOUT,
                 wizard_mode=self.wizard_mode
@@ -763,7 +768,7 @@ class Orchestrator:
         
         # Run repair with column hints if available
         fixed = loop.run(
-            self.project_dir / "generated_scraper.py", 
+            self._scraper_path, 
             runner,
             column_hints=fix_columns
         )
@@ -810,7 +815,7 @@ class Orchestrator:
             if action == "config":
                 self._transition_to(State.USER_CONFIG)
             elif action == "edit":
-                log(f"Manual edit requested. Script is at: {self.project_dir}/generated_scraper.py")
+                log(f"Manual edit requested. Script is at: {self._scraper_path}")
                 input("Press ENTER when you have finished editing the script...")
                 self._transition_to(State.TEST)
             else:
@@ -833,7 +838,7 @@ class Orchestrator:
         )
         def do_final():
             return ScriptTester.run_test(
-                self.project_dir / "generated_scraper.py",
+                self._scraper_path,
                 self.project_dir,
                 timeout=600,
                 wizard_mode=self.wizard_mode
@@ -847,7 +852,7 @@ class Orchestrator:
             
             if self.wizard_mode:
                 output_format = self.session.get('format', 'xlsx')
-                output_file = self.project_dir / "output" / f"data.{output_format}"
+                output_file = self._output_dir / f"data.{output_format}"
                 print(f"\n✅ Done!\n")
                 
                 # Print AI Usage Summary
@@ -864,7 +869,7 @@ class Orchestrator:
                 print(f"Your data is ready:")
                 print(f"{output_file}\n")
             else:
-                log(f"Final run complete. All files bundled in {self.project_dir}/output")
+                log(f"Final run complete. All files bundled in {self._output_dir}")
             self._transition_to(State.DONE)
         else:
             if not self.wizard_mode:
@@ -877,9 +882,19 @@ class Orchestrator:
         User requested: script, logs, JSON configs, .env all in one place.
         """
         import shutil
-        output_dir = self.project_dir / "output"
+        from concurrent.futures import ThreadPoolExecutor
+        output_dir = self._output_dir
         output_dir.mkdir(exist_ok=True)
         
+        # Generate HTML Report first (data.json is already in the output folder)
+        # so that report.html and the report's log lines are bundled below
+        try:
+            from scrapewizard.report.html_generator import ReportGenerator
+            generator = ReportGenerator(self.project_dir)
+            generator.generate()
+        except Exception as e:
+            log(f"Failed to generate HTML report: {e}", level="warning")
+        
         # Files to copy
         files_to_bundle = [
             "generated_scraper.py",
@@ -889,45 +904,31 @@ class Orchestrator:
             "session.json",
             "interaction.json",
             "cookies.json",
-            ".env"
+            ".env",
+            "report.html"
         ]
         
-        for fname in files_to_bundle:
-            src = self.project_dir / fname
-            if src.exists():
-                shutil.copy2(src, output_dir / fname)
-        
-        # Copy logs folder
-        logs_src = self.project_dir / "logs"
-        logs_dst = output_dir / "logs"
-        if logs_src.exists():
-            if logs_dst.exists():
-                shutil.rmtree(logs_dst)
-            shutil.copytree(logs_src, logs_dst)
+        def sync_dir(src: Path, dst: Path) -> None:
+            if dst.exists():
+                shutil.rmtree(dst)
+            shutil.copytree(src, dst)
+        
+        # Copies are independent I/O, so run them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = []
+            for fname in files_to_bundle:
+                src = self.project_dir / fname
+                if src.exists():
+                    futures.append(executor.submit(shutil.copy2, src, output_dir / fname))
             
-        # Generate HTML Report (AFTER data.json is in output folder)
-        try:
-            from scrapewizard.report.html_generator import ReportGenerator
-            generator = ReportGenerator(self.project_dir)
-            generator.generate()
-            report_src = self.project_dir / "report.html"
-            if report_src.exists():
-                shutil.copy2(report_src, output_dir / "report.html")
-        except Exception as e:
-            log(f"Failed to generate HTML report: {e}", level="warning")
-        logs_dst = output_dir / "logs"
-        if logs_src.exists():
-            if logs_dst.exists():
-                shutil.rmtree(logs_dst)
-            shutil.copytree(logs_src, logs_dst)
-        
-        # Copy llm_logs folder
-        llm_logs_src = self.project_dir / "llm_logs"
-        llm_logs_dst = output_dir / "llm_logs"
-        if llm_logs_src.exists():
-            if llm_logs_dst.exists():
-                shutil.rmtree(llm_logs_dst)
-            shutil.copytree(llm_logs_src, llm_logs_dst)
+            # Copy logs and llm_logs folders
+            for dirname in ("logs", "llm_logs"):
+                src = self.project_dir / dirname
+                if src.exists():
+                    futures.append(executor.submit(sync_dir, src, output_dir / dirname))
+            
+            for future in futures:
+                future.result()
         
         if not self.wizard_mode:
             log("Project files bundled into output folder.")
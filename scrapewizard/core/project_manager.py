@@ -34,7 +34,9 @@ class ProjectManager:
         
         # Extract domain for friendlier name
         domain = url.split("//")[-1].split("/")[0].replace("www.", "").replace(".", "_")
-        timestamp = datetime.now().strftime("%Y_%m_%d_%H%M")
+        # Read the clock once for both the directory name and created_at
+        now = datetime.now()
+        timestamp = now.strftime("%Y_%m_%d_%H%M")
         project_name = f"project_{domain}_{timestamp}"
         project_dir = cls.PROJECTS_ROOT / project_name
         
@@ -53,7 +55,7 @@ class ProjectManager:
         # Initialize Session
         session_data = {
             "project_id": project_name,
-            "created_at": datetime.now().isoformat(),
+            "created_at": now.isoformat(),
             "url": url,
             "state": State.INIT.value,
             "project_dir": str(project_dir),
@@ -26,7 +26,20 @@ class RepairLoop:
         test_runner should return (success: bool, error_msg: str)
         column_hints: optional list of column names that need fixing
         """
+        try:
+            return self._run(script_path, test_runner, column_hints)
+        finally:
+            self.agent.close()
+
+    def _run(
+        self,
+        script_path: Path,
+        test_runner: Callable[[], tuple[bool, str]],
+        column_hints: Optional[List[str]]
+    ) -> bool:
         attempts = 0
+        # Known script contents after a repair, so the agent need not re-read it
+        current_code = None
         
         while attempts <= self.max_attempts:
             if attempts > 0:
@@ -66,7 +79,8 @@ class RepairLoop:
             
             # Call repair
             try:
-                self.agent.repair(script_path, output, context=context, bad_cols=column_hints)
+                self.agent.repair(script_path, output, context=context, bad_cols=column_hints, current_code=current_code)
+                current_code = self.agent.last_code
             except Exception as e:
                 import traceback
                 log(f"Repair agent failed: {e}", level="error")
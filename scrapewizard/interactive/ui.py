@@ -1,17 +1,141 @@
-from InquirerPy import inquirer
-from InquirerPy.base.control import Choice
+import asyncio
+import shutil
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from rich.text import Text
 from typing import List, Dict, Any, Tuple, Optional
+from scrapewizard.core.config import ConfigManager
+from scrapewizard.core.constants import NULL_SCAN_SAMPLE_ROWS
 
-console = Console()
+# Probe the terminal once at import; Rich would otherwise re-detect size on renders
+console = Console(width=shutil.get_terminal_size((100, 24)).columns, highlight=False)
+
+# Preview cell rendering
+_NULL_CELL = "[dim]null[/dim]"
+_truncate_cell = "{:.37}...".format
+
+def _row_getter(columns: List[str]):
+    """Fetch `columns` from a row as a sequence with one C-level call."""
+    getter = itemgetter(*columns)
+    return getter if len(columns) > 1 else lambda row: (getter(row),)
+
+# InquirerPy pulls in prompt_toolkit, which dominates CLI startup, so it
+# and the less common Rich renderables are imported on first use.
+@lru_cache(maxsize=1)
+def _inquirer():
+    from InquirerPy import inquirer
+    return inquirer
+
+@lru_cache(maxsize=None)
+def _choices(spec: Tuple[Tuple[str, str], ...]) -> tuple:
+    """Materialize a (value, name) spec into InquirerPy Choices once."""
+    from InquirerPy.base.control import Choice
+    return tuple(Choice(value, name) for value, name in spec)
+
+@lru_cache(maxsize=1)
+def _verify_panel():
+    """Page verification help, rendered as one panel."""
+    from rich.panel import Panel
+    return Panel(
+        Text.from_markup(
+            "[white]ScrapeWizard has reached a page and needs your confirmation before continuing.[/white]\n"
+            "\n[dim]Please check the browser window and confirm:[/dim]\n"
+            "  1. Is this the [bold]correct page[/bold] with the data you want?\n"
+            "  2. Does it match your requirements (table, list, profile, etc.)?\n"
+            "\n[yellow]If YES:[/yellow] Type [bold green]Y[/bold green] to continue.\n"
+            "[yellow]If NO (Blocker/Wrong Page):[/yellow]\n"
+            "  • Solve any CAPTCHA/Login/Popup in the browser.\n"
+            "  • Navigate to the correct page if needed.\n"
+            "  • Then return here and type [bold green]Y[/bold green]."
+        ),
+        title="[bold yellow]⚠️  Page Verification Required[/bold yellow]",
+        border_style="yellow"
+    )
+
+# Static prompt choices as (value, name) specs; see _choices()
+_BROWSER_MODE_CHOICES = (
+    ("headless", "Headless (Invisible, Faster)"),
+    ("headed", "Headed (Visible, Better Compatibility)"),
+)
+_GUIDED_ONLY_CHOICES = (
+    ("guided", "Open Browser (Guided)"),
+)
+_ACCESS_MODE_CHOICES = (
+    ("automatic", "Automatic (Headless, fastest)"),
+    ("guided", "Guided (Open real browser, I will navigate manually)"),
+)
+_SUGGESTED_FIELDS_CHOICES = (
+    ("yes", "✅ Yes, these look correct"),
+    ("no", "❌ No, let me pick manually"),
+    ("retry", "🔍 Look again (Deep Scan)"),
+)
+_FIELD_MODE_CHOICES = (
+    ("all", "Select ALL fields"),
+    ("choose", "Choose specific fields"),
+)
+_PAGINATION_CHOICES = (
+    ("all_pages", "All Pages (scrape everything)"),
+    ("first_page", "First Page Only (quick test)"),
+    ("limit_5", "Limit to 5 Pages"),
+)
+_FORMAT_CHOICES = (
+    ("json", "JSON"),
+    ("csv", "CSV"),
+    ("xlsx", "Excel"),
+    ("all", "All formats"),
+)
+_REVIEW_CHOICES = (
+    ("approve", "✅ Looks good - proceed with full scraping"),
+    ("fix_columns", "🩺 Auto-fix: Let AI repair specific columns"),
+    ("guided", "🖐️  Manual: Re-run in Guided Mode (Fix in browser)"),
+    ("retry", "🔄 Re-generate everything (Full retry)"),
+    ("abort", "❌ Cancel and exit"),
+)
+_TEST_FAILURE_CHOICES = (
+    ("repair", "🩺 Attempt Auto-Repair (AI-driven)"),
+    ("config", "📋 Back to Configuration (Change fields/mode)"),
+    ("edit", "📝 Manual Fix (Open code in editor)"),
+    ("abort", "❌ Abort and exit"),
+)
+_REPAIR_FAILURE_CHOICES = (
+    ("config", "📋 Back to Configuration"),
+    ("edit", "📝 Manual Fix"),
+    ("abort", "❌ Abort and exit"),
+)
+
+# Invariant prompt definitions, expanded per call by _prompt_kwargs()
+_SAVE_CREDENTIALS_PROMPT = {"message": "Save username/password for the generated script?"}
+_APPROVE_RUN_PROMPT = {"message": "Proceed with full scraping?"}
+_PAGINATION_PROMPT = {"message": "Pagination Strategy:", "choices": _PAGINATION_CHOICES}
+_FORMAT_PROMPT = {"message": "Output Format:", "choices": _FORMAT_CHOICES}
+_REPAIR_FAILURE_PROMPT = {
+    "message": "How would you like to proceed?",
+    "choices": _REPAIR_FAILURE_CHOICES,
+    "default": "config"
+}
+
+def _prompt_kwargs(spec: Dict[str, Any], **overrides: Any) -> Dict[str, Any]:
+    """Build InquirerPy keyword arguments from a prompt spec, copying the cached choices."""
+    kwargs = {**spec, **overrides}
+    if "choices" in kwargs:
+        kwargs["choices"] = list(_choices(kwargs["choices"]))
+    return kwargs
 
 class UI:
     """
     Handles all interactive user prompts with rich display.
     """
     
+    @staticmethod
+    def _print_block(*renderables: Any) -> None:
+        """Render several items off-screen and write them to the terminal in one call."""
+        with console.capture() as capture:
+            for renderable in renderables:
+                console.print(renderable)
+        console.file.write(capture.get())
+        console.file.flush()
 
     @staticmethod
     def confirm_browser_mode(recommended: str, reason: str, wizard_mode: bool = False) -> str:
@@ -21,23 +145,22 @@ class UI:
             return recommended
         
         # Expert mode: show prompt
-        console.print(f"\n[bold cyan]🔍 Browser Mode Analysis[/bold cyan]")
         color = "yellow" if recommended == "headed" else "green"
-        console.print(f"Recommended: [{color}]{recommended.upper()}[/{color}]")
-        console.print(f"[dim]Reason: {reason}[/dim]")
+        UI._print_block(
+            "\n[bold cyan]🔍 Browser Mode Analysis[/bold cyan]",
+            f"Recommended: [{color}]{recommended.upper()}[/{color}]",
+            f"[dim]Reason: {reason}[/dim]"
+        )
         
-        return inquirer.select(
+        return _inquirer().select(
             message="Confirm browser mode:",
-            choices=[
-                Choice("headless", "Headless (Invisible, Faster)"),
-                Choice("headed", "Headed (Visible, Better Compatibility)")
-            ],
+            choices=list(_choices(_BROWSER_MODE_CHOICES)),
             default=recommended
         ).execute()
 
     @staticmethod
     def ask_save_credentials() -> bool:
-        return inquirer.confirm(message="Save username/password for the generated script?").execute()
+        return _inquirer().confirm(**_prompt_kwargs(_SAVE_CREDENTIALS_PROMPT)).execute()
 
     @staticmethod
     def ask_access_mode(recommendation: str = "automatic", reason: str = "") -> str:
@@ -45,44 +168,45 @@ class UI:
         Step 3: Unified Access Mode Selection.
         Replaces 'Does this site require login?' with a smarter choice.
         """
-        console.print(f"\n[bold cyan]🔐 Access Mode Recommendation[/bold cyan]")
+        block = ["\n[bold cyan]🔐 Access Mode Recommendation[/bold cyan]"]
         
         if recommendation == "guided":
             if "Hostile" in reason:
                 # Wizard Mode: No choice, explanation only
-                console.print(f"[bold red]🛡️  Bot Protection Detected[/bold red]")
-                console.print(f"[yellow]This website uses active bot defenses ({reason}).[/yellow]")
-                console.print("[white]ScrapeWizard will open a real browser so you can navigate normally.[/white]")
-                console.print("[dim]Headless mode is disabled to prevent blocking.[/dim]")
-                return inquirer.select(
+                UI._print_block(
+                    *block,
+                    "[bold red]🛡️  Bot Protection Detected[/bold red]\n"
+                    f"[yellow]This website uses active bot defenses ({reason}).[/yellow]\n"
+                    "[white]ScrapeWizard will open a real browser so you can navigate normally.[/white]\n"
+                    "[dim]Headless mode is disabled to prevent blocking.[/dim]"
+                )
+                return _inquirer().select(
                     message="Proceed with Guided Access?",
-                    choices=[Choice(name="Open Browser (Guided)", value="guided")],
+                    choices=list(_choices(_GUIDED_ONLY_CHOICES)),
                     default="guided"
                 ).execute()
             
-            console.print(f"[yellow]⚠️  System recommends: GUIDED ACCESS (Headed)[/yellow]")
-            console.print(f"[dim]Reason: {reason}[/dim]")
+            block.append("[yellow]⚠️  System recommends: GUIDED ACCESS (Headed)[/yellow]")
+            block.append(f"[dim]Reason: {reason}[/dim]")
             default_val = "guided"
         else:
-            console.print(f"[green]✅ System recommends: AUTOMATIC (Headless)[/green]")
-            console.print(f"[dim]Reason: {reason or 'Site appears static and safe.'}[/dim]")
+            block.append("[green]✅ System recommends: AUTOMATIC (Headless)[/green]")
+            block.append(f"[dim]Reason: {reason or 'Site appears static and safe.'}[/dim]")
             default_val = "automatic"
 
-        console.print()
+        block.append("")
+        UI._print_block(*block)
         
-        return inquirer.select(
+        return _inquirer().select(
             message="How should ScrapeWizard reach the target data?",
-            choices=[
-                Choice(name="Automatic (Headless, fastest)", value="automatic"),
-                Choice(name="Guided (Open real browser, I will navigate manually)", value="guided")
-            ],
+            choices=list(_choices(_ACCESS_MODE_CHOICES)),
             default=default_val
         ).execute()
 
     @staticmethod
     def prompt_credentials() -> Dict[str, str]:
-        username = inquirer.text(message="Username:").execute()
-        password = inquirer.secret(message="Password:").execute()
+        username = _inquirer().text(message="Username:").execute()
+        password = _inquirer().secret(message="Password:").execute()
         return {"username": username, "password": password}
 
     @staticmethod
@@ -97,12 +221,11 @@ class UI:
             return True
 
         # Show table
-        UI.show_data_preview(data, max_rows=5)
+        columns = list(data[0])
+        UI.show_data_preview(data, max_rows=5, columns=columns)
         
         # Check for quality issues
-        columns = list(data[0].keys())
-        null_counts = {col: sum(1 for row in data if not row.get(col)) for col in columns}
-        bad_cols = [col for col, count in null_counts.items() if count > len(data) * 0.8] # >80% null
+        bad_cols = UI._sparse_columns(data, columns, 0.8) # >80% null
         
         if bad_cols:
             console.print(f"\n[bold yellow]⚠️  Warning: High missing data in columns: {', '.join(bad_cols)}[/bold yellow]")
@@ -111,6 +234,43 @@ class UI:
         return False
         
 
+    @staticmethod
+    def _sparse_columns(data: List[Dict[str, Any]], columns: List[str], ratio: float) -> List[str]:
+        """
+        Return the columns whose share of empty values exceeds `ratio`.
+        The ratio is estimated from the first NULL_SCAN_SAMPLE_ROWS rows, and a column
+        stops being counted as soon as it crosses the threshold.
+        """
+        if not columns:
+            return []
+        sample_size = min(len(data), NULL_SCAN_SAMPLE_ROWS)
+        threshold = sample_size * ratio
+        pending = list(columns)
+        counts = [0] * len(pending)
+        getter = _row_getter(pending)
+        sparse = set()
+        for row in islice(data, sample_size):
+            try:
+                values = getter(row)
+            except KeyError:
+                # Row is missing a column; fall back to per-key lookups
+                values = [row.get(col) for col in pending]
+            crossed = False
+            for i, val in enumerate(values):
+                if not val:
+                    counts[i] += 1
+                    if counts[i] > threshold:
+                        crossed = True
+            if crossed:
+                sparse.update(col for col, count in zip(pending, counts) if count > threshold)
+                kept = [(col, count) for col, count in zip(pending, counts) if count <= threshold]
+                if not kept:
+                    break
+                pending = [col for col, _ in kept]
+                counts = [count for _, count in kept]
+                getter = _row_getter(pending)
+        return [col for col in columns if col in sparse]
+
     @staticmethod
     def ask_fields_wizard(available_fields: List[Dict[str, Any]], suggested_fields: List[Dict[str, Any]], interactive: bool = False) -> List[str]:
         """
@@ -130,13 +290,9 @@ class UI:
             return suggested_names
         
         # Interactive mode only
-        choice = inquirer.select(
+        choice = _inquirer().select(
             message="Use these suggested fields?",
-            choices=[
-                Choice(value="yes", name="✅ Yes, these look correct"),
-                Choice(value="no", name="❌ No, let me pick manually"),
-                Choice(value="retry", name="🔍 Look again (Deep Scan)")
-            ],
+            choices=list(_choices(_SUGGESTED_FIELDS_CHOICES)),
             default="yes"
         ).execute()
         
@@ -157,23 +313,29 @@ class UI:
             console.print("[yellow]No fields detected. Will use default extraction.[/yellow]")
             return []
         
-        console.print("\n[bold cyan]Available Fields Detected:[/bold cyan]")
+        from rich.padding import Padding
+        from rich.table import Table
+        grid = Table.grid(padding=(0, 1))
+        grid.add_column(justify="right")
+        grid.add_column(style="green")
+        grid.add_column()
+        grid.add_column(style="dim")
         for i, f in enumerate(available_fields, 1):
-            name = f.get('name', 'unknown')
-            desc = f.get('description', '')
-            selector = f.get('selector_guess', 'auto')
-            console.print(f"  {i}. [green]{name}[/green] - {desc} [dim](selector: {selector})[/dim]")
-        print()
+            grid.add_row(
+                f"{i}.",
+                f.get('name', 'unknown'),
+                f"- {f.get('description', '')}",
+                f"(selector: {f.get('selector_guess', 'auto')})"
+            )
+        UI._print_block("\n[bold cyan]Available Fields Detected:[/bold cyan]", Padding(grid, (0, 0, 0, 2), expand=False), "")
         
         # Ask user: select all or choose specific?
-        select_mode = inquirer.select(
+        select_mode = _inquirer().select(
             message="Field selection mode:",
-            choices=[
-                Choice("all", "Select ALL fields"),
-                Choice("choose", "Choose specific fields")
-            ],
-            default="all"
+            choices=list(_choices(_FIELD_MODE_CHOICES)),
+            default=ConfigManager.load_prefs().get("field_selection_mode", "all")
         ).execute()
+        ConfigManager.save_pref("field_selection_mode", select_mode)
         
         if select_mode == "all":
             all_names = [f.get('name', 'unknown') for f in available_fields]
@@ -181,13 +343,14 @@ class UI:
             return all_names
             
         # Manual selection
+        from InquirerPy.base.control import Choice
         choices = []
         for f in available_fields:
             name = f.get('name', 'unknown')
             desc = f.get('description', '')
             choices.append(Choice(name=f"{name} ({desc})", value=name))
             
-        selected = inquirer.checkbox(
+        selected = _inquirer().checkbox(
             message="Select fields to scrape (use SPACE to toggle, ENTER to confirm):",
             choices=choices,
             validate=lambda result: len(result) > 0 or "Select at least one field.",
@@ -200,84 +363,73 @@ class UI:
     @staticmethod
     def ask_pagination() -> str:
         """Step 6.3: Pagination."""
-        return inquirer.select(
-            message="Pagination Strategy:",
-            choices=[
-                Choice("all_pages", "All Pages (scrape everything)"),
-                Choice("first_page", "First Page Only (quick test)"),
-                Choice("limit_5", "Limit to 5 Pages")
-            ]
-        ).execute()
+        last = ConfigManager.load_prefs().get("pagination")
+        choice = _inquirer().select(**_prompt_kwargs(_PAGINATION_PROMPT, default=last)).execute()
+        ConfigManager.save_pref("pagination", choice)
+        return choice
 
     @staticmethod
     def ask_format() -> str:
         """Step 6.4: Output Format."""
-        return inquirer.select(
-            message="Output Format:",
-            choices=[
-                Choice("json", "JSON"),
-                Choice("csv", "CSV"),
-                Choice("xlsx", "Excel"),
-                Choice("all", "All formats")
-            ]
-        ).execute()
+        last = ConfigManager.load_prefs().get("format", "json")
+        choice = _inquirer().select(**_prompt_kwargs(_FORMAT_PROMPT, default=last)).execute()
+        ConfigManager.save_pref("format", choice)
+        return choice
 
     @staticmethod
     async def wait_for_solve(reason: str = "") -> bool:
         """Pause execution for Page Verification."""
-        console.print(f"\n[bold yellow]⚠️  Page Verification Required[/bold yellow]")
-        console.print("[white]ScrapeWizard has reached a page and needs your confirmation before continuing.[/white]")
-        console.print("\n[dim]Please check the browser window and confirm:[/dim]")
-        console.print("  1. Is this the [bold]correct page[/bold] with the data you want?")
-        console.print("  2. Does it match your requirements (table, list, profile, etc.)?")
-        console.print("\n[yellow]If YES:[/yellow] Type [bold green]Y[/bold green] to continue.")
-        console.print("[yellow]If NO (Blocker/Wrong Page):[/yellow]")
-        console.print("  • Solve any CAPTCHA/Login/Popup in the browser.")
-        console.print("  • Navigate to the correct page if needed.")
-        console.print("  • Then return here and type [bold green]Y[/bold green].")
+        console.print(_verify_panel())
         
-        return await inquirer.confirm(
-            message="Ready to scrape this view?",
-            default=True
-        ).execute_async()
+        # Run the blocking prompt in a worker thread so the browser's
+        # coroutines keep running while the user solves the page
+        return await asyncio.to_thread(
+            lambda: _inquirer().confirm(message="Ready to scrape this view?", default=True).execute()
+        )
 
     @staticmethod
     def override_llm_hallucination(reason: str) -> bool:
-        console.print(f"\n[bold yellow]⚠️  LLM thinks scraping may NOT be feasible.[/bold yellow]")
-        console.print(f"[dim]Reason: {reason}[/dim]")
-        return inquirer.confirm(message="Continue anyway?", default=False).execute()
+        UI._print_block(
+            "\n[bold yellow]⚠️  LLM thinks scraping may NOT be feasible.[/bold yellow]",
+            f"[dim]Reason: {reason}[/dim]"
+        )
+        return _inquirer().confirm(message="Continue anyway?", default=False).execute()
 
     @staticmethod
-    def show_data_preview(data: List[Dict[str, Any]], max_rows: int = 5) -> None:
+    def show_data_preview(data: List[Dict[str, Any]], max_rows: int = 5, columns: Optional[List[str]] = None) -> None:
         """
         Display a rich table preview of scraped data.
+        Callers that already extracted the column list can pass it as `columns`.
         """
         if not data:
             console.print("[yellow]No data to preview.[/yellow]")
             return
             
         # Build table
+        from rich.table import Table
         table = Table(title=f"📊 Data Preview (First {min(len(data), max_rows)} rows)")
         
         # Get columns from first row
-        columns = list(data[0].keys())
+        if columns is None:
+            columns = list(data[0])
         for col in columns:
             table.add_column(col, style="cyan", overflow="fold")
         
-        # Add rows
+        # Add rows (cells are mapped straight into add_row, no per-row list)
+        add_row = table.add_row
+        format_cell = UI._format_cell
         for row in data[:max_rows]:
-            values = []
-            for col in columns:
-                val = row.get(col, "")
-                # Truncate long values
-                val_str = str(val) if val else "[dim]null[/dim]"
-                if len(val_str) > 40:
-                    val_str = f"{val_str[:37]}..."
-                values.append(val_str)
-            table.add_row(*values)
+            add_row(*map(format_cell, map(row.get, columns)))
         
-        console.print(table)
-        console.print(f"\n[dim]Total rows: {len(data)}[/dim]")
+        UI._print_block(table, f"\n[dim]Total rows: {len(data)}[/dim]")
+
+    @staticmethod
+    def _format_cell(val: Any) -> str:
+        """Render one preview cell, truncating long values to 40 characters."""
+        if not val:
+            return _NULL_CELL
+        val_str = str(val)
+        return val_str if len(val_str) <= 40 else _truncate_cell(val_str)
 
     @staticmethod
     def review_data_quality(data: List[Dict[str, Any]]) -> Tuple[str, Optional[List[str]]]:
@@ -289,35 +441,26 @@ class UI:
             return ("abort", None)
         
         # Show preview first
-        UI.show_data_preview(data)
+        columns = list(data[0])
+        UI.show_data_preview(data, columns=columns)
         
         # Check for null/empty columns
-        columns = list(data[0].keys())
-        problematic = []
-        for col in columns:
-            null_count = sum(1 for row in data if not row.get(col))
-            if null_count > len(data) * 0.5:  # More than 50% null
-                problematic.append(col)
+        problematic = UI._sparse_columns(data, columns, 0.5)  # More than 50% null
         
         if problematic:
             console.print(f"\n[yellow]⚠️  Potential issues detected in columns: {', '.join(problematic)}[/yellow]")
         
         # Ask user
-        action = inquirer.select(
+        action = _inquirer().select(
             message="How does the data look?",
-            choices=[
-                Choice("approve", "✅ Looks good - proceed with full scraping"),
-                Choice("fix_columns", "🩺 Auto-fix: Let AI repair specific columns"),
-                Choice("guided", "🖐️  Manual: Re-run in Guided Mode (Fix in browser)"),
-                Choice("retry", "🔄 Re-generate everything (Full retry)"),
-                Choice("abort", "❌ Cancel and exit")
-            ]
+            choices=list(_choices(_REVIEW_CHOICES))
         ).execute()
         
         if action == "fix_columns":
             # Let user select which columns are problematic
+            from InquirerPy.base.control import Choice
             col_choices = [Choice(name=col, value=col) for col in columns]
-            bad_cols = inquirer.checkbox(
+            bad_cols = _inquirer().checkbox(
                 message="Select columns that have incorrect data:",
                 choices=col_choices
             ).execute()
@@ -328,22 +471,19 @@ class UI:
     @staticmethod
     def approve_run() -> bool:
         """Simple approve prompt."""
-        return inquirer.confirm(message="Proceed with full scraping?").execute()
+        return _inquirer().confirm(**_prompt_kwargs(_APPROVE_RUN_PROMPT)).execute()
 
     @staticmethod
     def ask_test_failure_action(error_msg: str) -> str:
         """Handle the case where a test run fails."""
-        console.print(f"\n[bold red]❌ Test Execution Failed[/bold red]")
-        console.print(f"[dim]Error: {error_msg[:200]}...[/dim]\n")
+        UI._print_block(
+            "\n[bold red]❌ Test Execution Failed[/bold red]",
+            f"[dim]Error: {error_msg[:200]}...[/dim]\n"
+        )
         
-        return inquirer.select(
+        return _inquirer().select(
             message="What would you like to do?",
-            choices=[
-                Choice("repair", "🩺 Attempt Auto-Repair (AI-driven)"),
-                Choice("config", "📋 Back to Configuration (Change fields/mode)"),
-                Choice("edit", "📝 Manual Fix (Open code in editor)"),
-                Choice("abort", "❌ Abort and exit")
-            ],
+            choices=list(_choices(_TEST_FAILURE_CHOICES)),
             default="repair"
         ).execute()
 
@@ -352,12 +492,4 @@ class UI:
         """Handle the case where auto-repair fails."""
         console.print(f"\n[bold yellow]⚠️  Auto-Repair was unable to fix the issue.[/bold yellow]")
         
-        return inquirer.select(
-            message="How would you like to proceed?",
-            choices=[
-                Choice("config", "📋 Back to Configuration"),
-                Choice("edit", "📝 Manual Fix"),
-                Choice("abort", "❌ Abort and exit")
-            ],
-            default="config"
-        ).execute()
+        return _inquirer().select(**_prompt_kwargs(_REPAIR_FAILURE_PROMPT)).execute()
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+from scrapewizard.core.logging import log
+
+class LLMCache:
+    """
+    Persistent prompt/response cache backed by SQLite.
+    Identical requests (same provider, model, prompts and options) are served
+    locally instead of paying another network round-trip and token cost.
+    """
+
+    # Payloads larger than this are zlib-compressed before storage
+    COMPRESS_THRESHOLD = 4096
+    # Stored bytes kept before the oldest entries are evicted
+    MAX_BYTES = 50 * 1024 * 1024
+
+    def __init__(self, path: Path, ttl_days: float = 7, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a deterministic SHA256 key from the request parts."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, content BLOB, compressed INTEGER, "
+                "created REAL, provider TEXT, model TEXT)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached content for key, or None on miss/expiry."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT content, compressed, created FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            log(f"LLM cache read failed: {e}", level="warning")
+            return None
+
+        if not row:
+            return None
+        content, compressed, created = row
+        if time.time() - created > self.ttl_seconds:
+            return None
+        if compressed:
+            content = zlib.decompress(content)
+        return content.decode("utf-8")
+
+    def put(self, key: str, content: str, provider: str = "", model: str = "") -> None:
+        """Store content under key, compressing large payloads."""
+        data = content.encode("utf-8")
+        compressed = len(data) > self.COMPRESS_THRESHOLD
+        if compressed:
+            data = zlib.compress(data)
+        try:
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, data, int(compressed), now, provider, model),
+                )
+                self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as e:
+            log(f"LLM cache write failed: {e}", level="warning")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the oldest ones beyond max_bytes."""
+        conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(LENGTH(content)) OVER "
+            "(ORDER BY created DESC, key) AS running FROM entries) "
+            "WHERE running > ?)",
+            (self.max_bytes,),
+        )
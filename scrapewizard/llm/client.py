@@ -1,9 +1,58 @@
+import atexit
 import json
-from typing import Dict, Any, Optional
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from scrapewizard.core.config import ConfigManager
 from scrapewizard.core.logging import log
+from scrapewizard.llm.cache import LLMCache
+from scrapewizard.utils.file_io import loads
 from scrapewizard.utils.security import SecurityManager
 
+# First line that looks like Python (skips LLM preamble text)
+_CODE_START_RE = re.compile(r"^[ \t]*(?:import |from |class |def |async def |#!)", re.MULTILINE)
+
+# Post-extraction fixes for common LLM import hallucinations, applied in a
+# single pass. Group name -> replacement template.
+_HALLUCINATION_FIXES = {
+    "runtime": "from scrapewizard_runtime",
+    "from_pkg": "from playwright.async_api",
+    "import_pkg": r"\g<indent>from playwright.async_api import async_playwright",
+    "import_attr": "from playwright.async_api import async_playwright",
+    "pkg_attr": "playwright.async_api",
+    "qualified": "async_playwright",
+}
+_HALLUCINATION_RE = re.compile(
+    r"(?P<runtime>from\s+scrapewizard\.runtime\b)"
+    r"|(?P<from_pkg>\bfrom\s+async_playwright(?:\.async_api)?\b)"
+    r"|(?P<import_attr>from\s+playwright\.async_api\s+import\s+async_playwright\.async_api\b)"
+    r"|(?P<import_pkg>^(?P<indent>[ \t]*)import\s+(?:async_playwright|playwright\.async_api)\b)"
+    r"|(?P<pkg_attr>\basync_playwright\.async_api\b)"
+    r"|(?P<qualified>\bplaywright\.async_api\.async_playwright\b)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+@lru_cache(maxsize=32)
+def _redact(text: str) -> str:
+    """Memoized redaction: retries and re-runs send identical prompt bodies."""
+    return SecurityManager.redact_text(text)
+
+@lru_cache(maxsize=4)
+def _get_encoding(model: str) -> Any:
+    """Tokenizer for model, or None when tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def _fix_hallucination(match: "re.Match") -> str:
+    return match.expand(_HALLUCINATION_FIXES[match.lastgroup])
+
 class LLMClient:
     """
     Unified client for interacting with LLM providers.
@@ -11,7 +60,15 @@ class LLMClient:
     """
     
     # Class-level usage tracking to accumulate across all instances (agents)
-    _usage_stats = {"input_tokens": 0, "output_tokens": 0, "calls": 0}
+    _usage_stats = {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "calls": 0}
+    _stats_lock = threading.Lock()
+
+    # Process-wide SDK clients keyed on (provider, api_key, base_url) so all
+    # agents share one keep-alive connection pool
+    _CLIENT_POOL: Dict[Tuple, Any] = {}
+
+    # (provider, model) pairs known to reject response_format=json_object
+    _JSON_MODE_BLACKLIST: Set[Tuple[str, str]] = set()
     
     # Approximate pricing per 1M tokens ($USD)
     PRICING = {
@@ -23,12 +80,33 @@ class LLMClient:
         "claude-3-haiku": {"input": 0.25, "output": 1.25},
     }
 
+    # Price multiplier for prompt tokens served from the provider cache
+    CACHED_INPUT_DISCOUNT = 0.1
+    # Anthropic requires an explicit output budget
+    ANTHROPIC_MAX_TOKENS = 4096
+
+    # Context window sizes (tokens)
+    CONTEXT_LIMITS = {
+        "gpt-4-turbo": 128_000,
+        "gpt-4o": 128_000,
+        "gpt-4o-mini": 128_000,
+        "claude-3-5-sonnet": 200_000,
+        "claude-3-opus": 200_000,
+        "claude-3-haiku": 200_000,
+    }
+    # Tokens kept free for the response
+    RESPONSE_RESERVE = 1024
+
     def __init__(self, provider: Optional[str] = None, api_key: Optional[str] = None, model: Optional[str] = None):
         self.config = ConfigManager.load_config()
         self.provider = provider or self.config.get("provider", "openai")
         self.api_key = api_key or self.config.get("api_key")
         self.model = model or self.config.get("model", "gpt-4-turbo")
         self.client = None
+        # Opt-in ("llm_cache": true in config.json): serves identical requests locally
+        self._cache = None
+        if self.config.get("llm_cache", False):
+            self._cache = LLMCache(path=ConfigManager.CONFIG_DIR / "llm_cache.db", ttl_days=7)
         
         self._setup_client()
 
@@ -37,96 +115,355 @@ class LLMClient:
             log("API Key missing or redacted for LLM client.", level="warning")
             return
 
+        base_url = None
+        if self.provider == "openrouter":
+            base_url = "https://openrouter.ai/api/v1"
+        elif self.provider == "local":
+            base_url = "http://localhost:11434/v1" # Default Ollama
+            self.api_key = "ollama" # Dummy key
+
         try:
+            self.client = self._get_shared_client(self.provider, self.api_key, base_url)
             if self.provider == "anthropic":
-                import anthropic
-                self.client = anthropic.Anthropic(api_key=self.api_key)
                 log(f"Initialized Anthropic client with model: {self.model}")
-                return
-
-            import openai
-            base_url = None
-            if self.provider == "openrouter":
-                base_url = "https://openrouter.ai/api/v1"
-            elif self.provider == "local":
-                base_url = "http://localhost:11434/v1" # Default Ollama
-                self.api_key = "ollama" # Dummy key
-                
-            self.client = openai.OpenAI(
-                api_key=self.api_key,
-                base_url=base_url
-            )
         except ImportError as e:
             pkg = "anthropic" if self.provider == "anthropic" else "openai"
             log(f"{pkg} package not installed. Run 'pip install {pkg}'.", level="error")
 
+    @classmethod
+    def _get_shared_client(cls, provider: str, api_key: str, base_url: Optional[str]) -> Any:
+        """Return the pooled SDK client for these credentials, creating it once."""
+        key = (provider, api_key, base_url)
+        client = cls._CLIENT_POOL.get(key)
+        if client is not None:
+            return client
+
+        # The SDK clients keep their own keep-alive connection pool and
+        # default timeouts; sharing the client instance is what reuses it
+        if provider == "anthropic":
+            import anthropic
+            client = anthropic.Anthropic(api_key=api_key)
+        else:
+            import openai
+            client = openai.OpenAI(api_key=api_key, base_url=base_url)
+
+        if not cls._CLIENT_POOL:
+            atexit.register(cls._close_pool)
+        cls._CLIENT_POOL[key] = client
+        return client
+
+    @classmethod
+    def _close_pool(cls) -> None:
+        """Close all pooled clients and their connections."""
+        for client in cls._CLIENT_POOL.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        cls._CLIENT_POOL.clear()
+
     @classmethod
     def get_usage_stats(cls) -> Dict[str, Any]:
-        """Get the global usage statistics."""
-        return cls._usage_stats
+        """Get a snapshot of the global usage statistics."""
+        with cls._stats_lock:
+            return dict(cls._usage_stats)
+
+    @classmethod
+    def _record_usage(cls, input_tokens: int = 0, output_tokens: int = 0, calls: int = 0, cached_tokens: int = 0) -> None:
+        """Atomically add to the global usage counters."""
+        with cls._stats_lock:
+            cls._usage_stats["input_tokens"] += input_tokens or 0
+            cls._usage_stats["output_tokens"] += output_tokens or 0
+            cls._usage_stats["cached_tokens"] += cached_tokens or 0
+            cls._usage_stats["calls"] += calls
+
+    @classmethod
+    def _record_sdk_usage(cls, usage: Any, calls: int = 0) -> None:
+        """Record token counts from an OpenAI or Anthropic usage object.
+
+        input_tokens always counts every prompt token; cached_tokens is the
+        subset served from the provider's prompt cache.
+        """
+        try:
+            input_tokens, output_tokens = usage.prompt_tokens, usage.completion_tokens
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", 0) or 0
+        except AttributeError:
+            try:
+                # Anthropic reports cache reads/writes separately from input_tokens
+                cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+                created = getattr(usage, "cache_creation_input_tokens", 0) or 0
+                input_tokens = (usage.input_tokens or 0) + cached + created
+                output_tokens = usage.output_tokens
+            except AttributeError:
+                input_tokens = output_tokens = cached = 0
+        cls._record_usage(input_tokens, output_tokens, calls, cached_tokens=cached)
 
     def get_estimated_cost(self) -> float:
         """Calculate estimated cost based on tracked usage."""
         model_pricing = self.PRICING.get(self.model, {"input": 0, "output": 0})
-        stats = self._usage_stats
-        input_cost = (stats["input_tokens"] / 1_000_000) * model_pricing["input"]
+        stats = self.get_usage_stats()
+        # Cached prompt tokens are billed at roughly 10% of the input rate
+        cached = stats["cached_tokens"]
+        billable_input = stats["input_tokens"] - cached + cached * self.CACHED_INPUT_DISCOUNT
+        input_cost = (billable_input / 1_000_000) * model_pricing["input"]
         output_cost = (stats["output_tokens"] / 1_000_000) * model_pricing["output"]
         return input_cost + output_cost
 
-    def call(self, system_prompt: str, user_prompt: str, json_mode: bool = True) -> str:
+    def _check_context(self, system_prompt: str, user_prompt: str) -> None:
+        """Fail fast when a prompt cannot fit the model's context window."""
+        limit = self.CONTEXT_LIMITS.get(self.model)
+        if not limit:
+            return
+        enc = _get_encoding(self.model)
+        if enc is None:
+            return
+        tokens = len(enc.encode(system_prompt)) + len(enc.encode(user_prompt))
+        if tokens > limit - self.RESPONSE_RESERVE:
+            log(f"Prompt too large for {self.model}: {tokens} tokens (limit {limit}).", level="error")
+            raise RuntimeError(f"Prompt exceeds context window of {self.model} ({tokens} > {limit - self.RESPONSE_RESERVE} tokens).")
+
+    def call(self, system_prompt: str, user_prompt: str, json_mode: bool = True, max_tokens: Optional[int] = None, use_cache: bool = True) -> str:
         """
         Execute an LLM call.
+        max_tokens caps the response length (provider default when None).
+        use_cache=False always asks the provider (e.g. when regenerating).
         """
         if not self.client:
             raise RuntimeError("LLM Client not initialized. Check API Key.")
 
         # Security redaction
-        clean_user = SecurityManager.redact_text(user_prompt)
+        clean_user = _redact(user_prompt)
         
         # Determine if we should attempt JSON mode
-        use_json_mode = json_mode and self.provider in ["openai", "openrouter", "local"]
-        
-        kwargs = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": clean_user}
-            ],
-            "temperature": 0.1,
-        }
+        use_json_mode = (
+            json_mode
+            and self.provider in ["openai", "openrouter", "local"]
+            and (self.provider, self.model) not in LLMClient._JSON_MODE_BLACKLIST
+        )
+        temperature = 0.1
+
+        # Serve repeated identical requests from the local cache
+        cache_key = None
+        if self._cache and use_cache:
+            cache_key = LLMCache.make_key(self.provider, self.model, system_prompt, clean_user, json_mode, temperature, max_tokens)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                LLMClient._record_usage(calls=1)
+                log(f"LLM cache hit ({self.model})", level="debug")
+                return cached
         
-        if use_json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
+        self._check_context(system_prompt, clean_user)
+
+        if self.provider == "anthropic":
+            content = self._call_anthropic(system_prompt, clean_user, max_tokens)
+            if not content:
+                log("LLM returned empty content.", level="warning")
+                return "{}" if json_mode else ""
+            if cache_key:
+                self._cache.put(cache_key, content, provider=self.provider, model=self.model)
+            return content
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": clean_user}
+        ]
+
+        # JSON mode first (if supported), then plain text if the provider rejects it
+        for attempt_json in ((True, False) if use_json_mode else (False,)):
+            kwargs = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+            }
+            if max_tokens:
+                kwargs["max_tokens"] = max_tokens
+            if attempt_json:
+                kwargs["response_format"] = {"type": "json_object"}
+
+            try:
+                response = self.client.chat.completions.create(**kwargs)
+            except Exception as e:
+                error_msg = str(e).lower()
+                # Broad check for JSON mode rejection (OpenRouter, older models, etc.)
+                is_bad_request = "badrequesterror" in type(e).__name__.lower() or "400" in error_msg
+                is_json_mode_error = "response_format" in error_msg or "json_object" in error_msg
+                
+                if "authenticationerror" in type(e).__name__.lower():
+                    log(f"Authentication failed for {self.provider} ({self.model}). Check API key.", level="error")
+                elif (is_bad_request or is_json_mode_error) and attempt_json:
+                    log(f"LLM Provider {self.provider} rejected JSON mode. Retrying as plain text...", level="warning")
+                    continue
+                else:
+                    log(f"LLM Call failed ({self.model}): {type(e).__name__}: {e}", level="error")
+                raise
+
+            if use_json_mode and not attempt_json:
+                # Plain text worked where JSON mode did not; skip JSON mode from now on
+                LLMClient._JSON_MODE_BLACKLIST.add((self.provider, self.model))
 
-        try:
-            response = self.client.chat.completions.create(**kwargs)
-            
             # Track Usage
-            if hasattr(response, 'usage') and response.usage:
-                LLMClient._usage_stats["input_tokens"] += getattr(response.usage, 'prompt_tokens', 0)
-                LLMClient._usage_stats["output_tokens"] += getattr(response.usage, 'completion_tokens', 0)
-                LLMClient._usage_stats["calls"] += 1
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                LLMClient._record_sdk_usage(usage, calls=1)
 
             content = response.choices[0].message.content
             if not content:
                 log("LLM returned empty content.", level="warning")
                 return "{}" if json_mode else ""
+            if cache_key:
+                self._cache.put(cache_key, content, provider=self.provider, model=self.model)
             return content
+
+    def call_candidates(self, system_prompt: str, user_prompt: str, n: int = 2, temperature: float = 0.4, max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Request n alternative plain-text completions in a single API call.
+        Bills roughly n times the output tokens of call(); temperature must be
+        high enough for the choices to differ. Providers without multi-choice
+        support (Anthropic) return one, from call().
+        """
+        if not self.client:
+            raise RuntimeError("LLM Client not initialized. Check API Key.")
+        if self.provider == "anthropic" or n <= 1:
+            return [self.call(system_prompt, user_prompt, json_mode=False, max_tokens=max_tokens)]
+
+        clean_user = _redact(user_prompt)
+        self._check_context(system_prompt, clean_user)
+
+        kwargs = {}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": clean_user}
+                ],
+                temperature=temperature,
+                n=n,
+                **kwargs,
+            )
+        except Exception as e:
+            if "authenticationerror" in type(e).__name__.lower():
+                log(f"Authentication failed for {self.provider} ({self.model}). Check API key.", level="error")
+            else:
+                log(f"LLM Call failed ({self.model}): {type(e).__name__}: {e}", level="error")
+            raise
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLMClient._record_sdk_usage(usage, calls=1)
+
+        candidates = [choice.message.content for choice in response.choices if choice.message.content]
+        if not candidates:
+            log("LLM returned empty content.", level="warning")
+            return [""]
+        return candidates
+
+    def _call_anthropic(self, system_prompt: str, clean_user: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call the Anthropic Messages API, marking the (static) system prompt
+        for prompt caching so repeat calls bill it at the cached rate.
+        """
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens or self.ANTHROPIC_MAX_TOKENS,
+                temperature=0.1,
+                system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": clean_user}],
+            )
         except Exception as e:
-            error_msg = str(e).lower()
-            # Broad check for JSON mode rejection (OpenRouter, older models, etc.)
-            is_bad_request = "badrequesterror" in type(e).__name__.lower() or "400" in error_msg
-            is_json_mode_error = "response_format" in error_msg or "json_object" in error_msg
-            
             if "authenticationerror" in type(e).__name__.lower():
                 log(f"Authentication failed for {self.provider} ({self.model}). Check API key.", level="error")
-            elif (is_bad_request or is_json_mode_error) and json_mode:
-                log(f"LLM Provider {self.provider} rejected JSON mode. Retrying as plain text...", level="warning")
-                return self.call(system_prompt, user_prompt, json_mode=False)
             else:
                 log(f"LLM Call failed ({self.model}): {type(e).__name__}: {e}", level="error")
             raise
 
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLMClient._record_sdk_usage(usage, calls=1)
+        return "".join(block.text for block in response.content if getattr(block, "type", "") == "text")
+
+    def call_stream(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None, use_cache: bool = True) -> Iterator[str]:
+        """
+        Execute a plain-text LLM call, yielding content chunks as they arrive.
+        Only streams that run to completion are cached.
+        """
+        if not self.client:
+            raise RuntimeError("LLM Client not initialized. Check API Key.")
+
+        if self.provider == "anthropic":
+            # Not streamed; the Messages API path goes through call()
+            yield self.call(system_prompt, user_prompt, json_mode=False, max_tokens=max_tokens, use_cache=use_cache)
+            return
+
+        clean_user = _redact(user_prompt)
+        temperature = 0.1
+
+        # Same key as a non-JSON call(), so both paths share cache entries
+        cache_key = None
+        if self._cache and use_cache:
+            cache_key = LLMCache.make_key(self.provider, self.model, system_prompt, clean_user, False, temperature, max_tokens)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                LLMClient._record_usage(calls=1)
+                log(f"LLM cache hit ({self.model})", level="debug")
+                yield cached
+                return
+
+        self._check_context(system_prompt, clean_user)
+
+        kwargs = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": clean_user}
+            ],
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+
+        parts = []
+        stream = None
+        try:
+            stream = self.client.chat.completions.create(**kwargs)
+            for chunk in stream:
+                # The final chunk carries usage and no choices
+                usage = getattr(chunk, "usage", None)
+                if usage is not None:
+                    LLMClient._record_sdk_usage(usage)
+                if chunk.choices:
+                    text = chunk.choices[0].delta.content or ""
+                    if text:
+                        parts.append(text)
+                        yield text
+        except GeneratorExit:
+            # Consumer stopped early (e.g. the code block is complete); close
+            # the connection instead of paying for the remaining tokens
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            # Partial output must not be cached under the full request's key
+            LLMClient._record_usage(calls=1)
+            raise
+        except Exception as e:
+            if "authenticationerror" in type(e).__name__.lower():
+                log(f"Authentication failed for {self.provider} ({self.model}). Check API key.", level="error")
+            else:
+                log(f"LLM Stream failed ({self.model}): {type(e).__name__}: {e}", level="error")
+            raise
+
+        LLMClient._record_usage(calls=1)
+        if not parts:
+            log("LLM returned empty content.", level="warning")
+        elif cache_key:
+            self._cache.put(cache_key, "".join(parts), provider=self.provider, model=self.model)
+
     def parse_json(self, content: str) -> Dict[str, Any]:
         """Clean and parse JSON from LLM response with deep robustness."""
         if not content or not isinstance(content, str):
@@ -137,10 +474,14 @@ class LLMClient:
             cleaned = content.strip()
             
             # 2. Extract from markdown fences if present
-            import re
-            fence_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", cleaned, re.IGNORECASE)
-            if fence_match:
-                cleaned = fence_match.group(1).strip()
+            fence_start = cleaned.find("```")
+            if fence_start != -1:
+                fence_end = cleaned.find("```", fence_start + 3)
+                if fence_end != -1:
+                    body = cleaned[fence_start + 3:fence_end]
+                    if body[:4].lower() == "json":
+                        body = body[4:]
+                    cleaned = body.strip()
             
             # 3. Aggressive isolation: Find FIRST { and LAST }
             start = cleaned.find("{")
@@ -149,7 +490,7 @@ class LLMClient:
             if start != -1 and end != -1:
                 json_candidate = cleaned[start:end+1]
                 try:
-                    return json.loads(json_candidate)
+                    return loads(json_candidate)
                 except json.JSONDecodeError:
                     # If direct slice failed, try finding balanced braces (harder)
                     # For now just log and move to step 4
@@ -157,7 +498,7 @@ class LLMClient:
             
             # 4. Fallback: direct parse (maybe it's already pure JSON)
             try:
-                return json.loads(cleaned)
+                return loads(cleaned)
             except json.JSONDecodeError:
                 pass
                 
@@ -175,36 +516,40 @@ class LLMClient:
         Extract Python code from LLM response, handling markdown fences 
         and preamble text robustly.
         """
-        import re
-        # Try to find code in markdown fence
-        pattern = r"```(?:python)?\s*([\s\S]*?)```"
-        matches = re.findall(pattern, text)
-        if matches:
-            # Return the longest match (likely the full script)
-            code = max(matches, key=len)
-            return code.strip()
-        
-        # If no fence, try to find where code actually starts
-        lines = text.split('\n')
-        code_start = 0
-        for i, line in enumerate(lines):
+        # Single pass over lines: collect fenced blocks (``` or ~~~, any length)
+        # and keep the longest one (likely the full script)
+        best = None
+        body = None
+        fence = ""
+        # C-level substring search first: unfenced responses skip the line split
+        has_fence = "```" in text or "~~~" in text
+        for line in (text.splitlines(keepends=True) if has_fence else ()):
             stripped = line.strip()
-            if stripped.startswith(('import ', 'from ', 'class ', 'def ', 'async def ', '#!')):
-                code_start = i
-                break
-        
-        code = '\n'.join(lines[code_start:])
-        code = code.strip()
-        
+            if body is None:
+                if stripped.startswith(("```", "~~~")):
+                    char = stripped[0]
+                    fence = char * (len(stripped) - len(stripped.lstrip(char)))
+                    body = []
+            elif stripped.startswith(fence) and not stripped.strip(fence[0]):
+                block = "".join(body)
+                if best is None or len(block) > len(best):
+                    best = block
+                body = None
+            else:
+                body.append(line)
+        if body:
+            # Unterminated fence (e.g. truncated response)
+            block = "".join(body)
+            if best is None or len(block) > len(best):
+                best = block
+
+        if best is not None:
+            # Fenced code is returned as written
+            return best.strip()
+
+        # If no fence, try to find where code actually starts
+        start = _CODE_START_RE.search(text)
+        code = (text[start.start():] if start else text).strip()
+
         # Post-extraction fixes for common LLM hallucinations
-        code = re.sub(r'from\s+scrapewizard\.runtime\b', 'from scrapewizard_runtime', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bfrom\s+async_playwright\.async_api\b', 'from playwright.async_api', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bfrom\s+async_playwright\b', 'from playwright.async_api', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bimport\s+async_playwright\b', 'from playwright.async_api import async_playwright', code, flags=re.IGNORECASE)
-        code = re.sub(r'from\s+playwright\.async_api\s+import\s+async_playwright\.async_api', 'from playwright.async_api import async_playwright', code, flags=re.IGNORECASE)
-        code = re.sub(r'import\s+playwright\.async_api', 'from playwright.async_api import async_playwright', code, flags=re.IGNORECASE)
-        code = re.sub(r'\basync_playwright\.async_api\b', 'playwright.async_api', code, flags=re.IGNORECASE)
-        code = re.sub(r'\basync_playwright\b', 'playwright.async_api', code, flags=re.IGNORECASE)
-        code = re.sub(r'playwright\.async_api\.async_playwright', 'async_playwright', code, flags=re.IGNORECASE)
-
-        return code
+        return _HALLUCINATION_RE.sub(_fix_hallucination, code)
@@ -1,11 +1,15 @@
 import json
-import re
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional
 from scrapewizard.llm.client import LLMClient
+from scrapewizard.llm.prompt_compress import compress
 from scrapewizard.llm.prompts import SYSTEM_PROMPT_CODEGEN
+from scrapewizard.llm.trim import trim_snapshot
+from scrapewizard.core.constants import CODEGEN_MAX_TOKENS
 from scrapewizard.core.logging import log
-from scrapewizard.utils.file_io import safe_write_json
+from scrapewizard.utils.file_io import dumps, safe_write_json
 
 class CodeGenerator:
     """Handles the LLM Code Generation phase.
@@ -17,6 +21,7 @@ class CodeGenerator:
         self.client = client or LLMClient()
         self.project_dir = project_dir
         self.wizard_mode = wizard_mode
+        self._storage_state_path = project_dir / "storage_state.json"
 
     def generate(self, snapshot: Dict[str, Any], understanding: Dict[str, Any], run_config: Dict[str, Any], scan_profile: Dict[str, Any] = None, interaction: Dict[str, Any] = None) -> Path:
         """Generates the scraper based on analysis and configuration.
@@ -35,11 +40,8 @@ class CodeGenerator:
             log("Generating scraper code...")
         
         # Check for session state
-        has_storage = (self.project_dir / "storage_state.json").exists()
-        has_cookies = (self.project_dir / "cookies.json").exists()
-        
         cookies_context = ""
-        if (self.project_dir / "storage_state.json").exists():
+        if self._storage_state_path.exists():
             cookies_context = "- A 'storage_state.json' file exists and will be automatically loaded by the BaseScraper runtime.\n"
         
         # Navigation Steps context
@@ -47,7 +49,7 @@ class CodeGenerator:
         nav_context = ""
         if nav_steps:
             nav_context = f"""
-- USER NAVIGATION STEPS RECORDED: {json.dumps(nav_steps, indent=2)}
+- USER NAVIGATION STEPS RECORDED: {dumps(nav_steps)}
 - NOTE: These steps are passed to the Scraper class and will be automatically replayed by the ScrapeWizard BaseScraper runtime before calling navigate(). 
 - You should still implement navigate() if any additional dynamic setup is needed, otherwise you can leave it empty.
 """
@@ -62,36 +64,24 @@ Bot defense mechanisms detected. You MUST use headed mode (headless=False).
 DO NOT use headless mode under any circumstances.
 """
         
-        user_prompt = f"""
-Analysis Snapshot: {json.dumps(snapshot, indent=2)}
-LLM Understanding: {json.dumps(understanding, indent=2)}
-Run Config: {json.dumps(run_config, indent=2)}
-Behavioral Scan Profile: {json.dumps(scan_profile, indent=2) if scan_profile else "None"}
-Interaction: {json.dumps(interaction, indent=2) if interaction else "None"}
+        # Repeated selectors/URLs are sent once via a $refN legend
+        context, refs = compress({
+            "Analysis Snapshot": trim_snapshot(snapshot),
+            "LLM Understanding": understanding,
+            "Run Config": run_config,
+            "Behavioral Scan Profile": scan_profile or None,
+            "Interaction": interaction or None,
+        })
+        refs_context = f"REFS: {dumps(refs)}\n" if refs else ""
+        
+        user_prompt = f"""{refs_context}
+Context: {dumps(context)}
 
 {hostility_context}
 {cookies_context}
 
-Generate the 'generated_scraper.py' implementation.
-IMPORTANT: Output ONLY valid Python code. No explanations, no markdown.
-
-REQUIRED STRUCTURE:
+REQUIRED ENTRY POINT (end the script with exactly this block):
 ```python
-from scrapewizard_runtime import BaseScraper
-
-class Scraper(BaseScraper):
-    async def navigate(self):
-        # Implementation...
-        pass
-
-    async def get_items(self):
-        # Implementation...
-        return []
-
-    async def parse_item(self, item):
-        # Implementation...
-        return {{}}
-
 if __name__ == "__main__":
     Scraper(
         mode="{run_config.get('browser_mode', 'headless')}", 
@@ -101,33 +91,102 @@ if __name__ == "__main__":
         navigation_steps={json.dumps(nav_steps)}
     ).run()
 ```
-
-DATA QUALITY RULES:
-1. Prefer stable CSS selectors over dynamic classes.
-2. Use `await self.runtime.smart_wait(selector)` before querying elements.
-3. If a field is missing, set its value to `None` in the result dictionary.
-4. **CRITICAL**: Only return `None` from `parse_item` if the item is purely decorative or contains NO data fields at all. If any data field is found, return the record.
-5. Ensure the script structure strictly follows the REQUIRED STRUCTURE above.
 """
         
-        code = self.client.call(SYSTEM_PROMPT_CODEGEN, user_prompt, json_mode=False)
+        output_path = self.project_dir / "generated_scraper.py"
+        
+        # Stream the raw response to disk as it is generated, stopping as soon
+        # as a fenced script (entry point included) is closed so trailing
+        # commentary is never generated
+        chunks = []
+        pending = ""
+        in_fence = seen_main = done = False
+        raw_file = self._temp_file()
+        try:
+            with raw_file:
+                stream = self.client.call_stream(
+                    SYSTEM_PROMPT_CODEGEN, user_prompt, max_tokens=CODEGEN_MAX_TOKENS,
+                    # Codegen reruns (e.g. full retry) must get a fresh script
+                    use_cache=False,
+                )
+                for chunk in stream:
+                    chunks.append(chunk)
+                    raw_file.write(chunk.encode("utf-8"))
+                    
+                    *lines, pending = (pending + chunk).split("\n")
+                    for line in lines:
+                        stripped = line.strip()
+                        if stripped.startswith("```"):
+                            if in_fence and seen_main:
+                                done = True
+                                break
+                            in_fence = not in_fence
+                        elif in_fence and stripped.startswith("if __name__"):
+                            seen_main = True
+                    if done:
+                        stream.close()
+                        break
+        except BaseException:
+            os.unlink(raw_file.name)
+            raise
+        code = "".join(chunks)
         
-        # Save raw response
-        self._save_log("codegen_response.py", code)
+        # Save raw response (already on disk, so just move it into place)
+        log_dir = self.project_dir / "llm_logs"
+        log_dir.mkdir(exist_ok=True)
+        self._publish(raw_file.name, log_dir / "codegen_response.py")
         
         # Robust extraction: find Python code block
         code = self.client.extract_python_code(code)
         
-        output_path = self.project_dir / "generated_scraper.py"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(code)
+        # Cheap local compile check: fix detectable errors with a small prompt
+        # now rather than a full-context repair round after testing
+        code = self._fix_syntax(code)
+        
+        # Atomic swap so a failed run never leaves a half-written scraper
+        code_file = self._temp_file()
+        with code_file:
+            code_file.write(code.encode("utf-8"))
+        self._publish(code_file.name, output_path)
             
         if not self.wizard_mode:
             log(f"Scraper generated at {output_path}")
         return output_path
 
-    def _save_log(self, filename: str, content: str) -> None:
-        log_dir = self.project_dir / "llm_logs"
-        log_dir.mkdir(exist_ok=True)
-        with open(log_dir / filename, "w", encoding="utf-8") as f:
-            f.write(content)
+    def _fix_syntax(self, code: str, max_attempts: int = 2) -> str:
+        """Return code, or a targeted LLM fix of it if it does not compile."""
+        for _ in range(max_attempts):
+            try:
+                # compile() also catches errors ast.parse accepts, e.g. await outside async def
+                compile(code, "generated_scraper.py", "exec")
+                return code
+            except SyntaxError as e:
+                error = f"Line {e.lineno} col {e.offset}: {e.msg}"
+            
+            log(f"Generated code does not compile ({error}). Requesting a fix...", level="warning")
+            prompt = f"Fix this SyntaxError. {error}\nReturn the complete corrected script.\n```python\n{code}\n```"
+            fixed = self.client.extract_python_code(
+                self.client.call(SYSTEM_PROMPT_CODEGEN, prompt, json_mode=False, max_tokens=CODEGEN_MAX_TOKENS, use_cache=False)
+            )
+            if not fixed:
+                break
+            code = fixed
+        
+        # Whatever is left goes to the test/repair loop
+        return code
+
+    @staticmethod
+    def _publish(temp_name: str, dest: Path) -> None:
+        """Move a finished temp file into place with normal file permissions."""
+        # NamedTemporaryFile creates 0600 files; keep the mode of the file
+        # being replaced, or the usual 0644 for a new one
+        try:
+            mode = os.stat(dest).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, dest)
+
+    def _temp_file(self):
+        # Binary mode: callers write pre-encoded bytes, no text codec layer
+        return tempfile.NamedTemporaryFile("wb", dir=self.project_dir, suffix=".partial", delete=False)
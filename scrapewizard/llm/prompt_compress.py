@@ -0,0 +1,53 @@
+from collections import Counter
+from typing import Any, Dict, Iterator, Tuple
+
+# Only strings at least this long, repeated at least this often, are considered
+MIN_LENGTH = 8
+MIN_REPEATS = 3
+# Rough per-entry cost of a legend line: quotes, colon and separator
+_LEGEND_OVERHEAD = 6
+
+def _iter_strings(obj: Any) -> Iterator[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iter_strings(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _iter_strings(value)
+
+def _replace(obj: Any, refs: Dict[str, str]) -> Any:
+    if isinstance(obj, str):
+        return refs.get(obj, obj)
+    if isinstance(obj, dict):
+        return {k: _replace(v, refs) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace(v, refs) for v in obj]
+    return obj
+
+def compress(obj: Any) -> Tuple[Any, Dict[str, str]]:
+    """
+    Replace string values that repeat across the prompt context with short
+    `$refN` tokens.
+
+    Returns the rewritten object and a legend mapping each token back to its
+    string. A string is only replaced when doing so is smaller than leaving
+    it inline, legend entry included.
+    """
+    counts = Counter(s for s in _iter_strings(obj) if len(s) >= MIN_LENGTH)
+    refs: Dict[str, str] = {}
+    legend: Dict[str, str] = {}
+    for text, count in counts.most_common():
+        if count < MIN_REPEATS:
+            break
+        ref = f"$ref{len(refs)}"
+        saved = count * (len(text) - len(ref))
+        if saved <= len(text) + len(ref) + _LEGEND_OVERHEAD:
+            continue
+        refs[text] = ref
+        legend[ref] = text
+
+    if not refs:
+        return obj, {}
+    return _replace(obj, refs), legend
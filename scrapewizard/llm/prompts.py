@@ -61,6 +61,10 @@ SELECTOR STABILITY RULES (CRITICAL):
 3. Prefer semantic classes and stable structural patterns (e.g., .author, .title, .post-container).
 4. Use the CSS SELECTORS from the analysis snapshot as a base, but refine them for longevity.
 
+REFERENCE TOKENS:
+- Values like `$ref0`, `$ref1` in the context are shorthand for repeated strings; the `REFS:` legend at the top of the input maps each token to its full value.
+- Always substitute the full value in generated code. NEVER write a `$refN` token into the script.
+
 DYNAMIC WAITING & LOADING:
 - Use `await self.runtime.smart_wait("selector")` to ensure elements are loaded before interaction.
 - If the page uses lazy loading or infinite scroll, use `await self.runtime.scroll_down(times=N)` to trigger content loading.
@@ -95,6 +99,36 @@ DATA EXTRACTION BEST PRACTICES (CRITICAL):
 7. Only return `None` from `parse_item` if the item is purely decorative or invalid. Return partial data if some fields are missing.
 
 Start your response directly with the class definition or necessary imports - no other text.
+
+Generate the 'generated_scraper.py' implementation.
+IMPORTANT: Output ONLY valid Python code. No explanations, no markdown.
+
+REQUIRED STRUCTURE:
+```python
+from scrapewizard_runtime import BaseScraper
+
+class Scraper(BaseScraper):
+    async def navigate(self):
+        # Implementation...
+        pass
+
+    async def get_items(self):
+        # Implementation...
+        return []
+
+    async def parse_item(self, item):
+        # Implementation...
+        return {}
+
+# REQUIRED ENTRY POINT from the input goes here, unchanged.
+```
+
+DATA QUALITY RULES:
+1. Prefer stable CSS selectors over dynamic classes.
+2. Use `await self.runtime.smart_wait(selector)` before querying elements.
+3. If a field is missing, set its value to `None` in the result dictionary.
+4. **CRITICAL**: Only return `None` from `parse_item` if the item is purely decorative or contains NO data fields at all. If any data field is found, return the record.
+5. Ensure the script structure strictly follows the REQUIRED STRUCTURE above.
 """
 
 SYSTEM_PROMPT_REPAIR = """
@@ -1,12 +1,14 @@
-import re
-import json
+import itertools
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from scrapewizard.llm.client import LLMClient
 from scrapewizard.llm.prompts import SYSTEM_PROMPT_REPAIR
+from scrapewizard.llm.trim import trim_snapshot
+from scrapewizard.core.constants import REPAIR_MAX_TOKENS
 from scrapewizard.core.logging import log
-from scrapewizard.utils.file_io import safe_read_json, safe_write_json
+from scrapewizard.utils.file_io import dumps, safe_read_json, safe_write_json
 
 class RepairAgent:
     """Handles self-healing repair attempts using LLM analysis.
@@ -17,34 +19,42 @@ class RepairAgent:
     def __init__(self, project_dir: Path, client: Optional[LLMClient] = None):
         self.client = client or LLMClient()
         self.project_dir = Path(project_dir)
+        # filename -> (mtime_ns, serialized context string)
+        self._context_cache: Dict[str, Tuple[Optional[int], str]] = {}
+        self._log_dir_created = False
+        # Raw-response logs are written off the repair critical path
+        self._log_pool: Optional[ThreadPoolExecutor] = None
+        # Log names: agent start time plus a per-agent sequence number
+        self._log_session = int(time.time())
+        self._log_seq = itertools.count(1)
+        # Session files are written before any repair loop starts
+        self._has_storage = (self.project_dir / "storage_state.json").exists()
+        # Code written by the most recent repair
+        self.last_code: Optional[str] = None
 
-    def repair(self, script_path: Path, error_info: str, context: str = "", bad_cols: Optional[List[str]] = None) -> bool:
+    def repair(self, script_path: Path, error_info: str, context: str = "", bad_cols: Optional[List[str]] = None, current_code: Optional[str] = None) -> bool:
         """Attempts to repair a failing script using LLM intelligence.
         
         Args:
             script_path: Path to the script that failed.
             error_info: The error message or traceback from the failure.
             context: Optional additional context or user feedback.
+            bad_cols: Optional list of fields that returned no data.
+            current_code: Script contents if already known (skips the file read).
             
         Returns:
             True if a repair was attempted, False otherwise.
         """
         log("Attempting repair...")
         
-        with open(script_path, "r", encoding="utf-8") as f:
-            current_code = f.read()
+        if current_code is None:
+            current_code = Path(script_path).read_text(encoding="utf-8")
 
-        # Load additional context from project files
-        analysis = self._load_json("analysis_snapshot.json")
-        understanding = self._load_json("llm_understanding.json")
-        run_config = self._load_json("run_config.json")
-        
-        # Check for session state
-        has_storage = (self.project_dir / "storage_state.json").exists()
-        has_cookies = (self.project_dir / "cookies.json").exists()
+        # Project context rarely changes during a repair loop; cached by mtime
+        project_context = self._project_context()
         
         cookies_context = ""
-        if (self.project_dir / "storage_state.json").exists():
+        if self._has_storage:
             cookies_context = "- A 'storage_state.json' file exists and will be automatically loaded by the BaseScraper runtime.\n"
         
         field_fix_instruction = ""
@@ -63,13 +73,13 @@ Error Message:
 === PROJECT CONTEXT ===
 
 Analysis Snapshot (DOM structure):
-{json.dumps(analysis, indent=2) if analysis else "Not available"}
+{project_context["analysis_snapshot.json"]}
 
 LLM Understanding (field definitions):
-{json.dumps(understanding, indent=2) if understanding else "Not available"}
+{project_context["llm_understanding.json"]}
 
 Run Config (user selections):
-{json.dumps(run_config, indent=2) if run_config else "Not available"}
+{project_context["run_config.json"]}
 
 === INSTRUCTIONS ===
 Fix the plugin. Output ONLY Python code. No explanations, no markdown.
@@ -82,26 +92,68 @@ if __name__ == "__main__":
     Scraper(mode="...", output_format="...", pagination_config={{...}}, pagination_meta={{...}}).run()
 """
         
-        new_code = self.client.call(SYSTEM_PROMPT_REPAIR, user_prompt, json_mode=False)
+        # Ask for two alternative fixes in one request and keep the first that
+        # compiles, so a syntactically broken fix costs no extra round-trip.
+        # Trade-off: about twice the output tokens of a single fix, and
+        # temperature 0.4 instead of call()'s 0.1, since near-greedy sampling
+        # would return two copies of the same fix
+        candidates = self.client.call_candidates(
+            SYSTEM_PROMPT_REPAIR, user_prompt, n=2, temperature=0.4, max_tokens=REPAIR_MAX_TOKENS
+        )
         
-        # Save raw response
-        self._save_log(f"repair_response_{int(time.time())}.py", new_code)
+        raw_code = candidates[0]
+        new_code = self.client.extract_python_code(raw_code)
+        for raw in candidates:
+            code = self.client.extract_python_code(raw)
+            try:
+                compile(code, str(script_path), "exec")
+            except SyntaxError:
+                continue
+            raw_code, new_code = raw, code
+            break
         
-        # Robust extraction
-        new_code = self.client.extract_python_code(new_code)
+        # Save raw response in the background; nothing downstream reads it
+        if self._log_pool is None:
+            self._log_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repair-log")
+        self._log_pool.submit(self._save_log, f"repair_response_{self._log_session}_{next(self._log_seq):02d}.py", raw_code)
         
         # Save attempt
-        with open(script_path, "w", encoding="utf-8") as f:
-            f.write(new_code)
+        self.last_code = new_code
+        Path(script_path).write_bytes(new_code.encode("utf-8"))
             
         log("Repaired script saved.")
         return True
 
+    def close(self) -> None:
+        """Waits for pending log writes to finish."""
+        if self._log_pool is not None:
+            self._log_pool.shutdown(wait=True)
+            self._log_pool = None
+
     def _save_log(self, filename: str, content: str) -> None:
         log_dir = self.project_dir / "llm_logs"
-        log_dir.mkdir(exist_ok=True)
-        with open(log_dir / filename, "w", encoding="utf-8") as f:
-            f.write(content)
+        if not self._log_dir_created:
+            log_dir.mkdir(exist_ok=True)
+            self._log_dir_created = True
+        (log_dir / filename).write_bytes(content.encode("utf-8"))
+
+    def _project_context(self) -> Dict[str, str]:
+        """Serialized project context files, re-read only when they change on disk."""
+        context = {}
+        for filename in ("analysis_snapshot.json", "llm_understanding.json", "run_config.json"):
+            try:
+                mtime = (self.project_dir / filename).stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            cached = self._context_cache.get(filename)
+            if cached is None or cached[0] != mtime:
+                data = self._load_json(filename)
+                if filename == "analysis_snapshot.json":
+                    data = trim_snapshot(data)
+                cached = (mtime, dumps(data) if data else "Not available")
+                self._context_cache[filename] = cached
+            context[filename] = cached[1]
+        return context
 
     def _load_json(self, filename: str) -> Optional[Dict[str, Any]]:
         """Loads a JSON file from the project directory.
@@ -0,0 +1,21 @@
+from typing import Any, Dict
+from scrapewizard.core.constants import LLM_SNAPSHOT_MAX_SECTIONS, LLM_SNAPSHOT_MAX_FIELDS
+
+def trim_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an analysis snapshot to what codegen and repair prompts use:
+    the top-scored repeating sections (with a capped field list), pagination
+    and page metadata. The full snapshot stays on disk for auditing.
+    """
+    if not snapshot:
+        return snapshot
+
+    trimmed = dict(snapshot)
+    sections = snapshot.get("sections")
+    if sections:
+        # DOMAnalyzer already sorts sections by score
+        trimmed["sections"] = [
+            {**section, "fields": section.get("fields", [])[:LLM_SNAPSHOT_MAX_FIELDS]}
+            for section in sections[:LLM_SNAPSHOT_MAX_SECTIONS]
+        ]
+    return trimmed
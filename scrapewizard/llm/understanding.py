@@ -1,10 +1,9 @@
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional
 from scrapewizard.llm.client import LLMClient
 from scrapewizard.llm.prompts import SYSTEM_PROMPT_UNDERSTANDING
 from scrapewizard.core.logging import log
-from scrapewizard.utils.file_io import safe_write_json
+from scrapewizard.utils.file_io import dumps, safe_write_json
 
 class UnderstandingAgent:
     """Handles the 'Understanding & Feasibility' phase using LLM analysis.
@@ -35,13 +34,13 @@ class UnderstandingAgent:
         Detect the core data structure. For each field found in 'available_fields', 
         add a 'suggested' boolean (true if it's a primary data point like title/price).
         
-        {json.dumps(snapshot_data, indent=2)}
+        {dumps(snapshot_data)}
         
         Behavioral Scan Profile:
-        {json.dumps(scan_profile, indent=2) if scan_profile else "None"}
+        {dumps(scan_profile) if scan_profile else "None"}
         
         Interaction Log:
-        {json.dumps(interaction_log, indent=2) if interaction_log else "None"}
+        {dumps(interaction_log) if interaction_log else "None"}
         """
         
         response_text = self.client.call(SYSTEM_PROMPT_UNDERSTANDING, user_prompt)
@@ -59,5 +58,4 @@ class UnderstandingAgent:
     def _save_log(self, filename: str, content: str):
         log_dir = self.project_dir / "llm_logs"
         log_dir.mkdir(exist_ok=True)
-        with open(log_dir / filename, "w", encoding="utf-8") as f:
-            f.write(content)
+        (log_dir / filename).write_bytes(content.encode("utf-8"))
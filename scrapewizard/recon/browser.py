@@ -1,20 +1,52 @@
 import asyncio
 import json
+import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from scrapewizard.core.logging import log
 from scrapewizard.core.constants import (
     DEFAULT_BROWSER_TIMEOUT,
-    DEFAULT_USER_AGENT
+    DEFAULT_USER_AGENT,
+    HEADLESS_BROWSER_ARGS
 )
 
+# Bot-wall markers, one named group per block category, matched in a single pass
+_BLOCK_RE = re.compile(
+    r"(?P<cloudflare>cloudflare|ray id|checking your browser)"
+    r"|(?P<akamai>akamai|access denied|reference #)"
+    r"|(?P<perimeterx>px-captcha|perimeterx)"
+    r"|(?P<generic>bot detection|automated access)",
+    re.IGNORECASE,
+)
+_BLOCK_REASONS = {
+    "cloudflare": "Cloudflare Challenge",
+    "akamai": "Akamai/WAF Block",
+    "perimeterx": "PerimeterX CAPTCHA",
+    "generic": "Generic Bot Detection",
+}
+_AMAZON_RE = re.compile(r"amazon", re.IGNORECASE)
+_ROBOT_RE = re.compile(r"robot", re.IGNORECASE)
+
+# Resource types that don't affect the DOM and can be skipped during recon
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+async def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class BrowserManager:
     """
     Manages Playwright browser session for reconnaissance and recording.
     """
-    def __init__(self, headless: bool = True, proxy: Optional[Dict] = None, storage_state: Optional[Dict] = None, wizard_mode: bool = False):
+
+    def __init__(self, headless: bool = True, proxy: Optional[Dict] = None, storage_state: Optional[Dict] = None, wizard_mode: bool = False, block_resources: Optional[bool] = None):
         self.headless = headless
+        # Recon only needs the DOM; headed sessions are seen (and solved) by the user
+        self.block_resources = headless if block_resources is None else block_resources
         self.proxy = proxy
         self.storage_state = storage_state
         self.wizard_mode = wizard_mode
@@ -42,6 +74,8 @@ class BrowserManager:
         # Add stealth arguments for headed mode to bypass automation detection
         if not self.headless:
             launch_args["args"] = ["--disable-blink-features=AutomationControlled"]
+        else:
+            launch_args["args"] = list(HEADLESS_BROWSER_ARGS)
         
         if self.proxy:
              launch_args["proxy"] = self.proxy
@@ -57,6 +91,8 @@ class BrowserManager:
             context_args["storage_state"] = self.storage_state
 
         self.context = await self.browser.new_context(**context_args)
+        if self.block_resources:
+            await self.context.route("**/*", _block_heavy_resources)
         self.page = await self.context.new_page()
 
     async def close(self) -> None:
@@ -68,8 +104,12 @@ class BrowserManager:
         if self.playwright:
             await self.playwright.stop()
 
-    async def navigate(self, url: str, timeout: Optional[int] = None) -> Optional[Any]:
-        """Navigate to a URL with error handling."""
+    async def navigate(self, url: str, timeout: Optional[int] = None, grace_ms: Optional[int] = None) -> Optional[Any]:
+        """Navigate to a URL with error handling.
+
+        After DOMContentLoaded, waits up to 2s for the network to go idle.
+        Pass grace_ms to wait a fixed time instead (e.g. for slow SPAs).
+        """
         if not self.wizard_mode:
             log(f"Navigating to {url}")
         
@@ -78,7 +118,14 @@ class BrowserManager:
         
         try:
             response = await self.page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-            await self.page.wait_for_timeout(2000) # Grace period
+            if grace_ms is not None:
+                await self.page.wait_for_timeout(grace_ms)
+            else:
+                # Grace period, cut short once the page settles
+                try:
+                    await self.page.wait_for_load_state("networkidle", timeout=2000)
+                except PlaywrightTimeoutError:
+                    pass
             return response
         except Exception as e:
             if not self.wizard_mode:
@@ -88,18 +135,14 @@ class BrowserManager:
     async def check_health(self) -> Dict[str, Any]:
         """Check if the page is healthy or blocked by bots."""
         content = await self.page.content()
-        content_lower = content.lower()
         
-        blocks = []
-        if any(p in content_lower for p in ["cloudflare", "ray id", "checking your browser"]):
-            blocks.append("Cloudflare Challenge")
-        if any(p in content_lower for p in ["akamai", "access denied", "reference #"]):
-            blocks.append("Akamai/WAF Block")
-        if "px-captcha" in content_lower or "perimeterx" in content_lower:
-            blocks.append("PerimeterX CAPTCHA")
-        if "bot detection" in content_lower or "automated access" in content_lower:
-            blocks.append("Generic Bot Detection")
-        if "amazon" in content_lower and "robot" in content_lower:
+        found = set()
+        for match in _BLOCK_RE.finditer(content):
+            found.add(match.lastgroup)
+            if len(found) == len(_BLOCK_REASONS):
+                break
+        blocks = [reason for group, reason in _BLOCK_REASONS.items() if group in found]
+        if _AMAZON_RE.search(content) and _ROBOT_RE.search(content):
             blocks.append("Amazon Robot Check")
             
         return {
@@ -112,9 +155,12 @@ class BrowserManager:
         """Get current page HTML."""
         return await self.page.content()
 
-    async def take_screenshot(self, path: Path) -> None:
-        """Save a screenshot."""
-        await self.page.screenshot(path=str(path))
+    async def take_screenshot(self, path: Path, *, full_page: bool = False, quality: int = 70) -> None:
+        """Save a viewport screenshot, as JPEG unless path ends in .png."""
+        if Path(path).suffix.lower() == ".png":
+            await self.page.screenshot(path=str(path), full_page=full_page)
+        else:
+            await self.page.screenshot(path=str(path), type="jpeg", quality=quality, full_page=full_page)
 
     async def get_cookies(self) -> List[Dict]:
         """Get current cookies."""
@@ -131,35 +177,71 @@ class BrowserManager:
     async def start_interactive_recording(self) -> List[Dict]:
         """Inject scripts to record user interactions."""
         # Define the bridge function to receive events from JS
-        async def on_event(event_type: str, selector: str, value: str) -> None:
+        def record(event_type: str, selector: str, value: str, timestamp: float) -> None:
             if not self.wizard_mode:
                 log(f"Recorded: {event_type} on {selector}")
             self.recorded_events.append({
                 "type": event_type,
                 "selector": selector,
                 "value": value,
-                "timestamp": asyncio.get_event_loop().time()
+                "timestamp": timestamp
             })
 
+        async def on_event(event_type: str, selector: str, value: str, timestamp: float) -> None:
+            # The page queues events and sends them as one JSON 'batch' call
+            if event_type == "batch":
+                for batched in json.loads(selector):
+                    record(*batched)
+            else:
+                record(event_type, selector, value, timestamp)
+
         await self.page.expose_function("recordPy", on_event)
         
         # Inject event listeners
         init_script = """
-        document.addEventListener('click', (e) => {
-            const target = e.target;
-            let selector = target.tagName.toLowerCase();
+        // Selectors are computed once per element and reused on later events
+        const _selCache = new WeakMap();
+        function sel(target) {
+            let selector = _selCache.get(target);
+            if (selector) return selector;
+            selector = target.tagName.toLowerCase();
             if (target.id) selector += '#' + target.id;
-            else if (target.className) selector += '.' + target.className.split(' ').join('.');
-            
-            window.recordPy('click', selector, '');
+            // SVG elements expose className as an SVGAnimatedString
+            else if (typeof target.className === 'string' && target.className.trim())
+                selector += '.' + target.className.trim().split(/\\s+/).join('.');
+            _selCache.set(target, selector);
+            return selector;
+        }
+        
+        // Events are queued and sent to Python in batches to save round-trips
+        const _queue = [];
+        let _timer = null;
+        function flush() {
+            if (_timer) { clearTimeout(_timer); _timer = null; }
+            if (_queue.length) {
+                window.recordPy('batch', JSON.stringify(_queue), '', now());
+                _queue.length = 0;
+            }
+        }
+        // Event time in epoch seconds, taken in the page rather than on receipt
+        function now() {
+            return (performance.timeOrigin + performance.now()) / 1000;
+        }
+        function enqueue(type, selector, value) {
+            _queue.push([type, selector, value, now()]);
+            if (!_timer) _timer = setTimeout(flush, 50);
+        }
+        
+        document.addEventListener('click', (e) => {
+            enqueue('click', sel(e.target), '');
         }, true);
         
         document.addEventListener('change', (e) => {
-             const target = e.target;
-             let selector = target.tagName.toLowerCase();
-             if (target.id) selector += '#' + target.id;
-             window.recordPy('input', selector, target.value);
+            enqueue('input', sel(e.target), e.target.value);
         }, true);
+        
+        // A click may navigate away; send whatever is queued before unload
+        window.addEventListener('pagehide', flush, true);
         """
         await self.page.add_init_script(init_script)
         
@@ -1,8 +1,10 @@
-from bs4 import BeautifulSoup
-from collections import Counter
+from bs4 import BeautifulSoup, NavigableString
+from collections import Counter, defaultdict
 import re
 from typing import Dict, List, Any
 
+_SAFE_CLASS_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
 class DOMAnalyzer:
     """
     Analyzes HTML to detect structure, repeating elements, and potential data fields.
@@ -11,7 +13,6 @@ class DOMAnalyzer:
     def __init__(self, html: str):
         self.soup = BeautifulSoup(html, "lxml")
         self.html_len = len(html)
-        self.SAFE_CLASS_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
 
     def analyze(self) -> Dict[str, Any]:
         """Perform full analysis."""
@@ -19,32 +20,36 @@ class DOMAnalyzer:
             "sections": self._detect_repeating_sections(),
         }
 
-    def _is_safe_class(self, cls: str) -> bool:
+    @staticmethod
+    def _is_safe_class(cls: str) -> bool:
         """
         Only allow classes that are safe for CSS selectors
         across BeautifulSoup, SoupSieve, and Playwright.
         """
         if not cls:
             return False
-        return self.SAFE_CLASS_RE.match(cls) is not None
+        # Fast path for the common case; isascii() keeps non-ASCII letters
+        # out, since isalnum() alone would accept them
+        if cls.isascii() and cls.replace("-", "").replace("_", "").isalnum():
+            return True
+        return _SAFE_CLASS_RE.match(cls) is not None
 
     def _is_rich_container(self, el) -> bool:
         """
         Check if a container element has enough structure to be a content block.
         Prevents picking shallow UI elements like single links or buttons.
         """
-        children = [c for c in el.find_all(recursive=False) if c.name]
-        return (
-            len(children) >= 2 and
-            len(set(child.name for child in children)) >= 2
-        )
-        if len(children) >= 2:
-            return True
-            
-        # Recursive check: if it has a single child that is rich
-        if len(children) == 1:
-            return self._is_rich_container(children[0])
-            
+        # Rich = at least two element children with different tag names;
+        # stop as soon as a second distinct name turns up
+        first_name = None
+        for child in el.contents:
+            name = getattr(child, "name", None)
+            if not name:
+                continue
+            if first_name is None:
+                first_name = name
+            elif name != first_name:
+                return True
         return False
 
     def _detect_repeating_sections(self) -> List[Dict]:
@@ -52,9 +57,12 @@ class DOMAnalyzer:
         Identify repeating blocks (e.g., product cards) by analyzing class distribution.
         Prioritizes deeper/richer nodes to avoid utility links in footers/sidebars.
         """
-        # Collect all tags with filtered "safe" classes
-        tag_groups = []
-        for tag in self.soup.find_all(True):
+        # Count occurrences of (Tag + SafeClasses), remembering where each
+        # group first appears so candidates need no selector re-lookup
+        counts = Counter()
+        # tag name -> {safe classes: (document position, first element)}
+        first_by_tag = defaultdict(dict)
+        for position, tag in enumerate(self.soup.find_all(True)):
             if tag.name in ["script", "style", "noscript", "svg", "link", "meta", "nav", "footer", "header"]:
                 continue
             
@@ -63,10 +71,9 @@ class DOMAnalyzer:
             safe_classes = tuple(sorted([c for c in raw_classes if self._is_safe_class(c)]))
             
             if safe_classes:
-                tag_groups.append((tag.name, safe_classes))
-        
-        # Count occurrences of (Tag + SafeClasses)
-        counts = Counter(tag_groups)
+                key = (tag.name, safe_classes)
+                counts[key] += 1
+                first_by_tag[tag.name].setdefault(safe_classes, (position, tag))
         
         sections = []
         # Look at more candidates to find the richest one
@@ -76,9 +83,7 @@ class DOMAnalyzer:
                 full_selector = f"{tag_name}{class_selector}"
                 
                 # Check what fields are inside one instance
-                example_el = self.soup.select_one(full_selector)
-                if not example_el:
-                    continue
+                example_el = self._first_match(first_by_tag[tag_name], classes)
                 
                 # Minimum richness check (loosened)
                 if not self._is_rich_container(example_el):
@@ -105,67 +110,73 @@ class DOMAnalyzer:
         sections.sort(key=lambda x: x["score"], reverse=True)
         return sections[:12]
 
+    @staticmethod
+    def _first_match(groups: Dict[tuple, tuple], classes: tuple):
+        """
+        First element in document order carrying all of `classes`, i.e. what
+        select_one("tag.cls1.cls2") returns: any group whose safe classes are
+        a superset qualifies, not just the exact group.
+        """
+        wanted = set(classes)
+        best = None
+        for group_classes, (position, el) in groups.items():
+            if (best is None or position < best[0]) and wanted.issubset(group_classes):
+                best = (position, el)
+        return best[1]
+
     def _extract_potential_fields(self, element) -> List[Dict]:
         """
         Look for text/links/images inside a container element.
         """
+        # One walk of the subtree; kinds are kept apart so text fields still
+        # come first, then links, then images
+        texts, links, images = [], [], []
+        for node in element.descendants:
+            if isinstance(node, NavigableString):
+                # Text fields (titles, prices, ratings)
+                text = node.strip()
+                # Allow slightly longer text for descriptions
+                if 1 < len(text) < 250:
+                    parent = node.parent
+                    tag = parent.name
+                    
+                    if tag in ["script", "style", "noscript"]:
+                        continue
+                    
+                    # Try to get a valid selector
+                    raw_classes = parent.get("class", [])
+                    safe_classes = [c for c in raw_classes if self._is_safe_class(c)]
+                    
+                    if safe_classes:
+                        css = f"{tag}." + ".".join(safe_classes)
+                    else:
+                        css = tag
+                    texts.append(("text_field", css, text[:50]))
+            elif node.name == "a":
+                # Links (Prioritize those with high-level classes)
+                href = node.get("href")
+                if href is not None:
+                    links.append(("link", self._tag_css(node), href[:50]))
+            elif node.name == "img":
+                # Images
+                src = node.get("src")
+                if src is not None:
+                    images.append(("image", self._tag_css(node), src[:50]))
+
         fields = []
         seen_selectors = set()
-        
-        # Text fields (titles, prices, ratings)
-        for child in element.find_all(text=True, recursive=True):
-            text = child.strip()
-            # Allow slightly longer text for descriptions
-            if 1 < len(text) < 250:
-                parent = child.parent
-                tag = parent.name
-                
-                if tag in ["script", "style", "noscript"]:
-                    continue
-                
-                # Try to get a valid selector
-                raw_classes = parent.get("class", [])
-                safe_classes = [c for c in raw_classes if self._is_safe_class(c)]
-                
-                if safe_classes:
-                    css = f"{tag}." + ".".join(safe_classes)
-                else:
-                    css = tag
-                
-                if css not in seen_selectors:
-                    fields.append({
-                        "name": "text_field",
-                        "css": css,
-                        "sample": text[:50]
-                    })
-                    seen_selectors.add(css)
-
-        # Links (Prioritize those with high-level classes)
-        for link in element.find_all("a", href=True):
-            raw_classes = link.get("class", [])
-            safe_classes = [c for c in raw_classes if self._is_safe_class(c)]
-            css = "a" + ("." + ".".join(safe_classes) if safe_classes else "")
-            
-            if css not in seen_selectors:
-                fields.append({
-                    "name": "link",
-                    "css": css,
-                    "sample": link['href'][:50]
-                })
-                seen_selectors.add(css)
-
-        # Images
-        for img in element.find_all("img", src=True):
-            raw_classes = img.get("class", [])
-            safe_classes = [c for c in raw_classes if self._is_safe_class(c)]
-            css = "img" + ("." + ".".join(safe_classes) if safe_classes else "")
-            
+        for name, css, sample in texts + links + images:
             if css not in seen_selectors:
                 fields.append({
-                    "name": "image",
+                    "name": name,
                     "css": css,
-                    "sample": img['src'][:50]
+                    "sample": sample
                 })
                 seen_selectors.add(css)
             
         return fields
+
+    def _tag_css(self, tag) -> str:
+        """Tag name plus its safe classes, e.g. 'a.product-link'."""
+        safe_classes = [c for c in tag.get("class", []) if self._is_safe_class(c)]
+        return tag.name + ("." + ".".join(safe_classes) if safe_classes else "")
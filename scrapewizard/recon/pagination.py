@@ -1,6 +1,9 @@
 from bs4 import BeautifulSoup
 from typing import Dict, Any
 
+_CANDIDATE_TAGS = frozenset(("a", "button"))
+_NEXT_TEXTS = frozenset(("next", "next page", ">", "»"))
+
 class PaginationDetector:
     """
     Detects pagination mechanisms on a page.
@@ -34,12 +37,12 @@ class PaginationDetector:
 
     def _find_next_button(self) -> str:
         """Heuristic for next button."""
-        # Check text content
-        candidates = self.soup.find_all(lambda tag: tag.name == 'a' or tag.name == 'button')
-        
-        for tag in candidates:
+        # Check text content; walk lazily so an early match stops the scan
+        for tag in self.soup.descendants:
+            if tag.name not in _CANDIDATE_TAGS:
+                continue
             text = tag.get_text().lower().strip()
-            if text in ["next", "next page", ">", "»"] or "next" in str(tag.get("class", [])):
+            if text in _NEXT_TEXTS or "next" in str(tag.get("class", [])):
                 # Construct selector
                 if tag.get("id"):
                     return f"#{tag['id']}"
@@ -1,12 +1,45 @@
 import json
 import logging
+import os
+import tempfile
 import traceback
 from pathlib import Path
 from typing import Any, Optional
 from scrapewizard.core.logging import log
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize to JSON, using orjson when it is installed.
+    Compact by default (prompt context); indent=True for files on disk.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+        except TypeError:
+            # orjson rejects e.g. non-string dict keys; the stdlib doesn't
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is strict RFC 8259 and rejects NaN/Infinity, which
+            # json.dump writes by default; let the stdlib have a go
+            pass
+    return json.loads(data)
+
 def safe_read_json(path: Path, default: Any = None) -> Any:
     """
     Safely read a JSON file with robust error handling.
@@ -15,11 +48,12 @@ def safe_read_json(path: Path, default: Any = None) -> Any:
         default = {}
     
     try:
-        if path.exists():
-            content = path.read_text(encoding="utf-8")
-            if not content.strip():
-                return default
-            return json.loads(content)
+        content = path.read_bytes()
+        if not content.strip():
+            return default
+        return loads(content)
+    except FileNotFoundError:
+        pass
     except json.JSONDecodeError as e:
         log(f"Corrupted JSON in {path.name}: {e}", level="error")
     except PermissionError as e:
@@ -37,7 +71,7 @@ def safe_write_json(path: Path, data: Any) -> bool:
     """
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        path.write_text(dumps(data, indent=True), encoding="utf-8")
         return True
     except PermissionError as e:
         log(f"Permission denied writing to {path.name}: {e}", level="error")
@@ -48,3 +82,33 @@ def safe_write_json(path: Path, data: Any) -> bool:
         raise
     
     return False
+
+def atomic_write_json(path: Path, data: Any) -> bool:
+    """
+    Write JSON to a sibling temp file and rename it into place, so a crash
+    mid-write never leaves a truncated file behind.
+    """
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=path.parent, suffix=".partial", delete=False) as f:
+            tmp_name = f.name
+            f.write(dumps(data, indent=True).encode("utf-8"))
+        # NamedTemporaryFile creates 0600 files; keep the replaced file's mode
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+        return True
+    except OSError as e:
+        log(f"IO error writing to {path.name}: {e}", level="error")
+    except Exception as e:
+        log(f"Unexpected error writing to {path.name}: {traceback.format_exc()}", level="error")
+        raise
+    finally:
+        if tmp_name and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    
+    return False
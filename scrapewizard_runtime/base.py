@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 
 from .runtime import Runtime
-from .io import write_json, write_csv, write_excel
+from .io import write_json, write_csv, write_excel, append_jsonl
 from .state import load_storage_state
 
 class BaseScraper(ABC):
@@ -27,6 +27,8 @@ class BaseScraper(ABC):
         self.runtime = None
         self.page = None
         self.results = []
+        self._seen_hashes = set()
+        self._pending_write = None
         self.script_dir = Path(os.path.dirname(os.path.abspath(__name__ if __name__ != "__main__" else __file__)))
 
     @abstractmethod
@@ -87,29 +89,45 @@ class BaseScraper(ABC):
                     print(f"  [Error] Parsing item {i}: {e}")
         
         print(f"Extracted {len(page_results)} valid records from this page.")
-        self.results.extend(page_results)
         
         # Robust Deduplication (across all pages)
-        unique_results = []
-        seen_hashes = set()
-        
-        for res in self.results:
+        # Only the new page is hashed; earlier pages are already unique.
+        new_results = []
+        for res in page_results:
             # Create a stable hash of the content
             content_str = "|".join(str(v).strip().lower() for v in res.values())
             content_hash = hash(content_str)
             
-            if content_hash not in seen_hashes:
-                seen_hashes.add(content_hash)
-                unique_results.append(res)
+            if content_hash not in self._seen_hashes:
+                self._seen_hashes.add(content_hash)
+                new_results.append(res)
         
-        removed_count = len(self.results) - len(unique_results)
+        removed_count = len(page_results) - len(new_results)
         if removed_count > 0:
             print(f"Deduplication: Removed {removed_count} duplicate records.")
             
-        self.results = unique_results
+        self.results.extend(new_results)
+        return new_results
+
+    async def _stream_records(self, records: List[Dict[str, Any]]):
+        """Append records to output/data.jsonl in a worker thread.
+
+        The write is left running so it overlaps with the next page load;
+        only the previous write is awaited to keep lines in order.
+        """
+        await self._flush_pending()
+        if records:
+            path = self.script_dir / "output" / "data.jsonl"
+            self._pending_write = asyncio.create_task(asyncio.to_thread(append_jsonl, records, path))
+
+    async def _flush_pending(self):
+        if self._pending_write:
+            await self._pending_write
+            self._pending_write = None
 
     async def save(self):
         output_dir = self.script_dir / "output"
+        await self._flush_pending()
         
         # Primary JSON for internal testing
         write_json(self.results, output_dir / "data.json")
@@ -174,9 +192,11 @@ class BaseScraper(ABC):
                 await self.navigate()
                 await self.runtime.wait_for_idle()
                 
-                # Main Extraction Loop
+                # Main Extraction Loop (records are streamed to data.jsonl per page)
+                (self.script_dir / "output" / "data.jsonl").unlink(missing_ok=True)
                 while True:
-                    await self.collect()
+                    new_results = await self.collect()
+                    await self._stream_records(new_results)
                     
                     if not await self._handle_pagination():
                         break
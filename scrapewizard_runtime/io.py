@@ -8,6 +8,11 @@ def write_json(data: List[Dict[str, Any]], filepath: Path):
     with open(filepath, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
 
+def append_jsonl(data: List[Dict[str, Any]], filepath: Path):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in data)
+
 def write_csv(data: List[Dict[str, Any]], filepath: Path):
     if not data:
         return
@@ -1,4 +1,5 @@
 import pytest
+import os
 import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -53,3 +54,28 @@ def test_migration_logic(tmp_path):
             assert "api_key" not in new_data
             assert new_data["provider"] == "anthropic"
             assert new_data["model"] == "claude-3"
+
+def test_prefs_roundtrip(tmp_path):
+    prefs_file = tmp_path / ".scrapewizard" / "prefs.json"
+    with patch.object(ConfigManager, "CONFIG_DIR", prefs_file.parent), \
+         patch.object(ConfigManager, "PREFS_FILE", prefs_file):
+        assert ConfigManager.load_prefs() == {}
+        
+        ConfigManager.save_pref("format", "csv")
+        ConfigManager.save_pref("pagination", "limit_5")
+        
+        assert ConfigManager.load_prefs() == {"format": "csv", "pagination": "limit_5"}
+
+@patch("keyring.get_password", return_value=None)
+def test_load_config_cached_until_file_changes(mock_get, tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"provider": "local"}))
+    with patch.object(ConfigManager, "CONFIG_FILE", config_file), \
+         patch.object(ConfigManager, "_config_cache", None):
+        assert ConfigManager.load_config()["provider"] == "local"
+        assert ConfigManager.load_config()["provider"] == "local"
+        assert mock_get.call_count == 1
+        
+        config_file.write_text(json.dumps({"provider": "openrouter"}))
+        os.utime(config_file, ns=(0, 0))
+        assert ConfigManager.load_config()["provider"] == "openrouter"
@@ -0,0 +1,33 @@
+import pytest
+from scrapewizard.interactive import ui
+from scrapewizard.interactive.ui import UI
+
+def test_sparse_columns_threshold():
+    data = [
+        {"title": "A", "price": None, "url": ""},
+        {"title": "B", "price": "$1", "url": ""},
+        {"title": "", "price": None, "url": ""},
+        {"title": "D", "price": None, "url": "/d"},
+    ]
+    assert UI._sparse_columns(data, ["title", "price", "url"], 0.5) == ["price", "url"]
+    assert UI._sparse_columns(data, ["title", "price", "url"], 0.8) == []
+
+def test_sparse_columns_missing_key():
+    data = [{"title": "A"}, {"title": "B"}, {"title": "C", "extra": "x"}]
+    assert UI._sparse_columns(data, ["title", "extra"], 0.5) == ["extra"]
+
+def test_sparse_columns_uses_sample(monkeypatch):
+    monkeypatch.setattr(ui, "NULL_SCAN_SAMPLE_ROWS", 2)
+    data = [{"title": "A"}, {"title": "B"}, {"title": None}, {"title": None}, {"title": None}]
+    assert UI._sparse_columns(data, ["title"], 0.5) == []
+
+def test_format_cell():
+    assert UI._format_cell(None) == "[dim]null[/dim]"
+    assert UI._format_cell("") == "[dim]null[/dim]"
+    assert UI._format_cell(42) == "42"
+    assert UI._format_cell("x" * 40) == "x" * 40
+    assert UI._format_cell("x" * 41) == "x" * 37 + "..."
+
+def test_sparse_columns_single_column():
+    data = [{"title": None}, {"title": None}, {"title": "C"}]
+    assert UI._sparse_columns(data, ["title"], 0.5) == ["title"]
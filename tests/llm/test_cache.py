@@ -0,0 +1,30 @@
+from scrapewizard.llm.cache import LLMCache
+
+def test_cache_roundtrip(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db")
+    key = LLMCache.make_key("openai", "gpt-4o", "sys", "user", True, 0.1)
+    assert cache.get(key) is None
+    cache.put(key, '{"ok": true}')
+    assert cache.get(key) == '{"ok": true}'
+
+def test_cache_compresses_large_payload(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db")
+    big = "x" * (LLMCache.COMPRESS_THRESHOLD * 2)
+    cache.put("k", big)
+    assert cache.get("k") == big
+
+def test_cache_expiry(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db", ttl_days=0)
+    cache.put("k", "v")
+    assert cache.get("k") is None
+
+def test_cache_key_is_deterministic():
+    assert LLMCache.make_key("a", 1) == LLMCache.make_key("a", 1)
+    assert LLMCache.make_key("a", 1) != LLMCache.make_key("a", 2)
+
+def test_cache_evicts_oldest_beyond_max_bytes(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db", max_bytes=10)
+    cache.put("old", "aaaaaa")
+    cache.put("new", "bbbbbb")
+    assert cache.get("old") is None
+    assert cache.get("new") == "bbbbbb"
@@ -28,3 +28,25 @@ def test_parse_json_empty():
     client = LLMClient()
     assert client.parse_json("") == {}
     assert client.parse_json("   ") == {}
+
+def test_extract_python_code_longest_fence():
+    raw = "Sure:\n```python\nx = 1\n```\nand\n```python\nimport os\nprint(os.name)\n```\n"
+    assert LLMClient.extract_python_code(raw) == "import os\nprint(os.name)"
+
+def test_extract_python_code_fixes_imports():
+    raw = "Here you go:\nimport async_playwright\nfrom scrapewizard.runtime import BaseScraper"
+    assert LLMClient.extract_python_code(raw) == (
+        "from playwright.async_api import async_playwright\n"
+        "from scrapewizard_runtime import BaseScraper"
+    )
+    valid = "from playwright.async_api import async_playwright"
+    assert LLMClient.extract_python_code(valid) == valid
+
+def test_extract_python_code_keeps_fenced_imports():
+    code = (
+        "import playwright.async_api as pw\n"
+        "from playwright.async_api import async_playwright\n"
+        "from scrapewizard_runtime import BaseScraper"
+    )
+    assert LLMClient.extract_python_code(f"```python\n{code}\n```") == code
+    assert LLMClient.extract_python_code(f"~~~\n{code}\n~~~") == code
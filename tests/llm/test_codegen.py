@@ -0,0 +1,84 @@
+from scrapewizard.llm.client import LLMClient
+from scrapewizard.llm.codegen import CodeGenerator
+
+SCRIPT = 'print("ok")\nif __name__ == "__main__":\n    pass\n'
+
+class StubStream:
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.consumed = []
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = next(self.chunks)
+        self.consumed.append(chunk)
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+class StubClient:
+    extract_python_code = staticmethod(LLMClient.extract_python_code)
+
+    def __init__(self, chunks, fixes=()):
+        self.stream = StubStream(chunks)
+        self.fixes = list(fixes)
+        self.call_prompts = []
+
+    def call_stream(self, system_prompt, user_prompt, max_tokens=None, use_cache=True):
+        return self.stream
+
+    def call(self, system_prompt, user_prompt, json_mode=True, max_tokens=None, use_cache=True):
+        self.call_prompts.append(user_prompt)
+        return self.fixes.pop(0)
+
+def _generate(tmp_path, client):
+    return CodeGenerator(tmp_path, wizard_mode=True, client=client).generate({}, {}, {})
+
+def test_generate_stops_after_closing_fence(tmp_path):
+    chunks = ["Here you go:\n```python\n", SCRIPT, "```\n", "Trailing commentary\n"]
+    client = StubClient(chunks)
+    output_path = _generate(tmp_path, client)
+
+    assert client.stream.closed
+    assert client.stream.consumed == chunks[:3]
+    assert output_path.read_text(encoding="utf-8") == SCRIPT.strip()
+    assert (tmp_path / "llm_logs" / "codegen_response.py").read_text(encoding="utf-8") == "".join(chunks[:3])
+    assert not list(tmp_path.glob("*.partial"))
+    assert output_path.stat().st_mode & 0o777 == 0o644
+    assert client.call_prompts == []
+
+def test_generate_keeps_streaming_without_entry_point(tmp_path):
+    chunks = ["```python\nprint(1)\n```\n", "```python\n", SCRIPT, "```\n", "More text\n"]
+    client = StubClient(chunks)
+    _generate(tmp_path, client)
+
+    # The first fenced block has no __main__ guard, so it is not the end
+    assert client.stream.consumed == chunks[:4]
+    assert client.stream.closed
+
+def test_generate_fixes_syntax_errors(tmp_path):
+    broken = 'def broken(:\nif __name__ == "__main__":\n    pass\n'
+    client = StubClient(["```python\n", broken, "```\n"], fixes=[f"```python\n{SCRIPT}```"])
+    output_path = _generate(tmp_path, client)
+
+    assert len(client.call_prompts) == 1
+    assert "SyntaxError" in client.call_prompts[0]
+    assert output_path.read_text(encoding="utf-8") == SCRIPT.strip()
+
+def test_fix_syntax_gives_up_after_max_attempts(tmp_path):
+    client = StubClient([], fixes=["```python\nstill broken(\n```", "```python\nbroken again(\n```"])
+    generator = CodeGenerator(tmp_path, wizard_mode=True, client=client)
+
+    assert generator._fix_syntax("broken(") == "broken again("
+    assert len(client.call_prompts) == 2
+
+def test_fix_syntax_leaves_valid_code_alone(tmp_path):
+    client = StubClient([])
+    generator = CodeGenerator(tmp_path, wizard_mode=True, client=client)
+
+    assert generator._fix_syntax(SCRIPT) == SCRIPT
+    assert client.call_prompts == []
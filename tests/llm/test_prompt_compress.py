@@ -0,0 +1,14 @@
+from scrapewizard.llm.prompt_compress import compress
+
+def test_compress_repeated_strings():
+    selector = "div.product-card > h2.title"
+    data = {"a": [selector, selector], "b": {"c": selector}, "d": "unique value here"}
+    compressed, legend = compress(data)
+    assert legend == {"$ref0": selector}
+    assert compressed == {"a": ["$ref0", "$ref0"], "b": {"c": "$ref0"}, "d": "unique value here"}
+
+def test_compress_skips_unprofitable():
+    data = ["shortish", "shortish", "shortish", "x", 1, None]
+    compressed, legend = compress(data)
+    assert legend == {}
+    assert compressed is data
@@ -0,0 +1,65 @@
+from scrapewizard.healing.repair_loop import RepairLoop
+from scrapewizard.llm.client import LLMClient
+from scrapewizard.llm.repair import RepairAgent
+
+BROKEN = "```python\ndef scrape(:\n    pass\n```"
+VALID = "```python\ndef scrape():\n    return 1\n```"
+
+class StubClient:
+    extract_python_code = staticmethod(LLMClient.extract_python_code)
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def call_candidates(self, system_prompt, user_prompt, n=2, temperature=0.4, max_tokens=None):
+        self.prompts.append(user_prompt)
+        return self.responses.pop(0)
+
+def _repair(tmp_path, *responses):
+    script = tmp_path / "generated_scraper.py"
+    script.write_text("old code", encoding="utf-8")
+    agent = RepairAgent(tmp_path, client=StubClient(*responses))
+    try:
+        assert agent.repair(script, "Traceback: boom")
+    finally:
+        agent.close()
+    return agent, script
+
+def test_repair_picks_first_compiling_candidate(tmp_path):
+    agent, script = _repair(tmp_path, [BROKEN, VALID])
+
+    assert agent.last_code == "def scrape():\n    return 1"
+    assert script.read_text(encoding="utf-8") == agent.last_code
+    (log_file,) = (tmp_path / "llm_logs").glob("repair_response_*.py")
+    assert log_file.read_text(encoding="utf-8") == VALID
+
+def test_repair_falls_back_to_first_candidate(tmp_path):
+    also_broken = "```python\nclass (:\n```"
+    agent, script = _repair(tmp_path, [BROKEN, also_broken])
+
+    # Nothing compiles: the first candidate goes to the test/repair loop
+    assert agent.last_code == "def scrape(:\n    pass"
+    assert script.read_text(encoding="utf-8") == agent.last_code
+
+def test_repair_loop_threads_last_code(tmp_path):
+    script = tmp_path / "generated_scraper.py"
+    script.write_text("original code", encoding="utf-8")
+    second = "```python\ndef scrape():\n    return 2\n```"
+    client = StubClient([BROKEN, VALID], [second])
+    loop = RepairLoop(tmp_path, wizard_mode=True, client=client)
+    results = iter([(False, "first failure"), (False, "second failure"), (True, "")])
+
+    def test_runner():
+        result = next(results)
+        if result[1] == "second failure":
+            # Only visible if the agent re-reads the script instead of using last_code
+            script.write_text("stale disk contents", encoding="utf-8")
+        return result
+
+    assert loop.run(script, test_runner)
+    assert "original code" in client.prompts[0]
+    assert "def scrape():\n    return 1" in client.prompts[1]
+    assert "stale disk contents" not in client.prompts[1]
+    assert script.read_text(encoding="utf-8") == "def scrape():\n    return 2"
+    assert loop.agent._log_pool is None
@@ -0,0 +1,21 @@
+from scrapewizard.core.constants import LLM_SNAPSHOT_MAX_SECTIONS, LLM_SNAPSHOT_MAX_FIELDS
+from scrapewizard.llm.trim import trim_snapshot
+
+def test_trim_snapshot_caps_sections_and_fields():
+    fields = [{"name": "text_field", "css": f".f{i}"} for i in range(LLM_SNAPSHOT_MAX_FIELDS + 5)]
+    snapshot = {
+        "sections": [{"selector": f"div.s{i}", "fields": fields} for i in range(LLM_SNAPSHOT_MAX_SECTIONS + 3)],
+        "pagination": {"type": "next_button"},
+        "meta": {"url": "https://example.com"},
+    }
+    trimmed = trim_snapshot(snapshot)
+    assert len(trimmed["sections"]) == LLM_SNAPSHOT_MAX_SECTIONS
+    assert all(len(s["fields"]) == LLM_SNAPSHOT_MAX_FIELDS for s in trimmed["sections"])
+    assert trimmed["pagination"] == snapshot["pagination"]
+    assert trimmed["meta"] == snapshot["meta"]
+    # Original is left untouched
+    assert len(snapshot["sections"]) == LLM_SNAPSHOT_MAX_SECTIONS + 3
+
+def test_trim_snapshot_empty():
+    assert trim_snapshot({}) == {}
+    assert trim_snapshot(None) is None
@@ -0,0 +1,33 @@
+from scrapewizard.recon.dom_analyzer import DOMAnalyzer
+
+def _page(body: str) -> str:
+    return f"<html><body>{body}</body></html>"
+
+def test_example_element_matches_class_superset():
+    # select_one("div.card") semantics: the promo cards (card + promo) come
+    # first in the document and are the example for div.card
+    html = _page(
+        '<div class="card promo"><a href="/ad">Ad</a></div>' * 3
+        + '<div class="card"><h2 class="title">Widget</h2><span class="price">$10</span></div>' * 5
+    )
+    sections = DOMAnalyzer(html).analyze()["sections"]
+    assert [s["selector"] for s in sections] == ["h2.title"]
+
+def test_repeating_cards_detected_with_fields():
+    html = _page(
+        '<div class="card"><h2 class="title">Widget</h2><a class="link" href="/w">More</a>'
+        '<img class="thumb" src="/w.jpg"></div>' * 4
+    )
+    best = DOMAnalyzer(html).analyze()["sections"][0]
+    assert best["selector"] == "div.card"
+    assert best["count"] == 4
+    assert [(f["name"], f["css"]) for f in best["fields"]] == [
+        ("text_field", "h2.title"),
+        ("text_field", "a.link"),
+        ("image", "img.thumb"),
+    ]
+
+def test_unsafe_classes_are_ignored():
+    html = _page('<li class="row md:flex"><span>Item text</span><b>x</b></li>' * 3)
+    sections = DOMAnalyzer(html).analyze()["sections"]
+    assert sections[0]["selector"] == "li.row"
@@ -0,0 +1,63 @@
+import json
+import pytest
+from scrapewizard_runtime.base import BaseScraper
+from scrapewizard_runtime.io import append_jsonl
+
+class StubScraper(BaseScraper):
+    """Serves one list of items per collect() call."""
+    def __init__(self, pages, script_dir):
+        super().__init__(output_format="json")
+        self.pages = iter(pages)
+        self.script_dir = script_dir
+
+    async def navigate(self):
+        pass
+
+    async def get_items(self):
+        return next(self.pages)
+
+    async def parse_item(self, item):
+        return item
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+@pytest.mark.asyncio
+async def test_collect_returns_only_new_rows(tmp_path):
+    scraper = StubScraper([
+        [{"title": "A"}, {"title": "B"}, {"title": "a "}],
+        [{"title": "B"}, {"title": "C"}],
+        [{"title": "A"}, {"title": "C"}],
+    ], tmp_path)
+
+    assert await scraper.collect() == [{"title": "A"}, {"title": "B"}]
+    assert await scraper.collect() == [{"title": "C"}]
+    assert await scraper.collect() == []
+    assert scraper.results == [{"title": "A"}, {"title": "B"}, {"title": "C"}]
+    assert len(scraper._seen_hashes) == 3
+
+@pytest.mark.asyncio
+async def test_streamed_jsonl_matches_saved_data(tmp_path):
+    scraper = StubScraper([
+        [{"title": "A", "price": "1"}, {"title": "é", "price": None}],
+        [{"title": "A", "price": "1"}],
+        [{"title": "B", "price": "2"}],
+    ], tmp_path)
+
+    for _ in range(3):
+        await scraper._stream_records(await scraper.collect())
+    await scraper.save()
+
+    output_dir = tmp_path / "output"
+    data = json.loads((output_dir / "data.json").read_text(encoding="utf-8"))
+    assert data == scraper.results
+    assert _read_jsonl(output_dir / "data.jsonl") == data
+    assert scraper._pending_write is None
+
+def test_append_jsonl(tmp_path):
+    path = tmp_path / "output" / "data.jsonl"
+    append_jsonl([{"title": "é"}], path)
+    append_jsonl([], path)
+    append_jsonl([{"title": "B"}, {"title": None}], path)
+
+    assert path.read_text(encoding="utf-8") == '{"title": "é"}\n{"title": "B"}\n{"title": null}\n'